@@ -1,29 +1,43 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash, send_from_directory
+from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash, send_from_directory, Response, stream_with_context, abort, g, before_render_template, template_rendered
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
 from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.utils import secure_filename
 from datetime import datetime
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
 import re
 import string
 import os
 import uuid
 import json
-import PyPDF2
-from docx import Document
+import threading
+import time
+import shutil
+import hashlib
+import base64
+from collections import Counter, OrderedDict
+import multiprocessing
+import click
+import csv
+from itertools import islice
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+import cProfile
+import io
+import pstats
 
-# Download required NLTK data
 try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+    import fcntl
+except ImportError:  # Windows: no cross-process compaction lock
+    fcntl = None
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///job_portal.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///job_portal.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 # File upload configuration
@@ -34,35 +48,342 @@ MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
+# Resume text extraction limits
+RESUME_MAX_PAGES = 20  # PDF pages read per resume
+RESUME_MAX_CHARS = 100000  # Characters of text kept per resume
+RESUME_PARSE_TIME_BUDGET = 10  # Seconds of extraction per resume before stopping early
+RESUME_CHUNK_OVERLAP = 64  # Characters of the previous chunk rescanned with the next one
+
+# Job listing configuration
+JOBS_PAGE_SIZE = 20
+JOBS_MAX_PAGE_SIZE = 100
+JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Remote']
+EMPLOYER_DASHBOARD_JOBS = 20  # Postings per page of the employer dashboard
+EMPLOYER_RECENT_APPLICATIONS = 4  # Newest applications in the employer dashboard feed
+APPLICATION_STATUSES = ['New', 'In Review', 'Hired', 'Rejected']
+
+# Bulk import and export configuration
+IMPORT_CHUNK_SIZE = 1000  # Rows inserted per transaction
+JOB_IMPORT_FIELDS = ('title', 'company', 'description', 'required_skills', 'experience_required', 'location',
+                     'salary', 'job_type', 'posted_by', 'contact_email')
+JOB_REQUIRED_FIELDS = ('title', 'company', 'description', 'required_skills', 'experience_required', 'location',
+                       'job_type', 'contact_email')
+USER_IMPORT_FIELDS = ('username', 'email', 'full_name', 'skills', 'experience', 'education', 'location', 'phone',
+                      'resume_summary')
+USER_REQUIRED_FIELDS = ('username', 'email', 'full_name')
+UNUSABLE_PASSWORD_HASH = '!'  # Imported users without a password cannot log in
+
+# Optional skill dictionary file, one skill per line, replacing the built-in list
+SKILLS_FILE = os.environ.get('SKILLS_FILE')
+
+# Background resume parsing configuration
+RESUME_PARSE_WORKERS = max(1, (os.cpu_count() or 2) // 2)  # Parser processes
+RESUME_QUEUE_MAX_PENDING = 200  # Queued resumes before registrations with uploads are refused
+RESUME_QUEUE_POLL_INTERVAL = 5  # Seconds between queue scans
+RESUME_PARSE_TIMEOUT = 5 * 60  # Seconds before a running task is considered abandoned
+RESUME_PARSE_MAX_ATTEMPTS = 3
+RESUME_GC_GRACE = 60 * 60  # Seconds an unreferenced upload is kept before garbage collection
+
+# Job index configuration
+INDEX_FOLDER = 'job_index'
+INDEX_FORMAT = 3  # Bump when the persisted index layout changes
+INDEX_RELOAD_INTERVAL = 2  # Seconds between checks for a new index version or journaled changes
+INDEX_COMPACTION_INTERVAL = 15 * 60  # Seconds between periodic refits
+INDEX_DRIFT_THRESHOLD = 0.15  # Drop in vocabulary coverage of new postings that forces a refit
+INDEX_GROWTH_THRESHOLD = 0.25  # Appended/removed rows relative to fitted rows that forces a refit
+ANN_MAX_FEATURES = 20000  # Vocabulary of the TF-IDF model the dense embeddings are projected from
+ANN_DIMENSIONS = 128  # Dense embedding size
+ANN_PROBES = 8  # Nearest IVF lists scanned per query
+INDEX_BUILD_CHUNK = 5000  # Job rows fetched per batch while fitting the index
+CANDIDATE_BUILD_CHUNK = 1000  # Users vectorized per query while building the candidate index
+
+# Recommendation scoring configuration
+RECOMMENDATION_MODE = os.environ.get('RECOMMENDATION_MODE', 'exact')  # exact TF-IDF cosine, or ann over dense embeddings
+MIN_SIMILARITY = 0.05  # Lower threshold for better matches
+MAX_MATCH_BONUS = 0.35  # Experience (0.1) + education (0.05) + skills (0.2)
+RECOMMENDATION_OVERFETCH = 10  # Candidates retrieved per requested recommendation
+RECOMMENDATION_BATCH_MEMORY = 64 * 1024 * 1024  # Bytes of dense scores per batch chunk
+RECOMMENDATION_BATCH_MAX_USERS = 1000  # User ids accepted by one batch API request
+RECOMMENDATION_CACHE_SIZE = 10000  # Profile vectors and ranked lists kept in each LRU cache
+CANDIDATES_DEFAULT = 10  # Candidates returned per job when top_n is not given
+
+# Metrics configuration
+METRICS_PREFIX = 'jobportal'
+METRICS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)  # Seconds
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED') == '1'  # Allow X-Profile requests to return cProfile output
+PROFILE_HEADER = 'X-Profile'
+PROFILE_TOP_FUNCTIONS = 40  # Functions listed in a profile, by cumulative time
+
 # Create upload directory if it doesn't exist
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
 db = SQLAlchemy(app)
 
+# Metrics: latency histograms rendered in the Prometheus text format at /metrics
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class Histogram:
+    """Cumulative latency histogram with one series per label combination"""
+    
+    def __init__(self, name, help_text, label_names, buckets=METRICS_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # Label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+    
+    def observe(self, labels, seconds):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[i] += 1
+            series[-2] += seconds
+            series[-1] += 1
+    
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted(self._series.items())
+        for labels, values in series:
+            label_text = ",".join(f'{name}="{escape_label(value)}"' for name, value in zip(self.label_names, labels))
+            prefix = label_text + "," if label_text else ""
+            for bound, count in zip(self.buckets, values):
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {values[-1]}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {values[-2]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {values[-1]}")
+        return lines
+
+class Metrics:
+    """Registry of the portal's histograms for this process"""
+    
+    def __init__(self):
+        self.requests = Histogram(f"{METRICS_PREFIX}_request_duration_seconds",
+                                  "Time to handle a request, by endpoint", ('endpoint', 'method', 'status'))
+        self.queries = Histogram(f"{METRICS_PREFIX}_sql_query_duration_seconds",
+                                 "Time to execute one SQL statement, by statement type", ('statement',))
+        self.stages = Histogram(f"{METRICS_PREFIX}_stage_duration_seconds",
+                                "Time spent in an instrumented stage of a hot path", ('stage',))
+        self._capture = threading.local()
+    
+    def observe_stage(self, stage, seconds):
+        captured = getattr(self._capture, 'observations', None)
+        if captured is not None:
+            captured.append((stage, seconds))
+        else:
+            self.stages.observe((stage,), seconds)
+    
+    @contextmanager
+    def capture(self):
+        """Collect stage observations in a list instead, to send them from a worker process"""
+        self._capture.observations = observations = []
+        try:
+            yield observations
+        finally:
+            self._capture.observations = None
+    
+    def render(self):
+        lines = []
+        for histogram in (self.requests, self.queries, self.stages):
+            lines += histogram.render()
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+@contextmanager
+def timed(stage):
+    """Record the time spent in a block (or decorated function) as a stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe_stage(stage, time.perf_counter() - start)
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def record_query_time(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ''
+    metrics.queries.observe((keyword if keyword in ('SELECT', 'INSERT', 'UPDATE', 'DELETE') else 'OTHER',), elapsed)
+
+@event.listens_for(Engine, 'handle_error')
+def discard_query_timer(context):
+    if context.connection is not None and context.connection.info.get('query_start'):
+        context.connection.info['query_start'].pop()
+
+# Common technical skills recognised in resumes and job postings
+SKILLS_KEYWORDS = [
+    'python', 'javascript', 'java', 'react', 'angular', 'vue', 'node.js', 'django', 'flask',
+    'sql', 'postgresql', 'mysql', 'mongodb', 'aws', 'azure', 'docker', 'kubernetes',
+    'git', 'github', 'machine learning', 'ai', 'data science', 'pandas', 'numpy',
+    'html', 'css', 'bootstrap', 'jquery', 'php', 'laravel', 'spring', 'express',
+    'typescript', 'c++', 'c#', '.net', 'ruby', 'rails', 'go', 'rust', 'swift',
+    'android', 'ios', 'react native', 'flutter', 'xamarin', 'unity', 'unreal',
+    'photoshop', 'illustrator', 'figma', 'sketch', 'adobe', 'ui/ux', 'design',
+    'project management', 'agile', 'scrum', 'devops', 'ci/cd', 'jenkins',
+    'linux', 'windows', 'macos', 'api', 'rest', 'graphql', 'microservices'
+]
+
+def load_skills(path):
+    """Read a skill dictionary file, skipping blank lines and # comments"""
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+class SkillMatcher:
+    """Find dictionary skills at word boundaries in a single regex pass.
+    
+    The skills are compiled into a character trie, so at each position the
+    regex follows one branch per character instead of trying every skill.
+    Overlapping mentions are all reported: the regex looks ahead from every
+    word start, and the shorter skills a match begins with ('react' in
+    'react native') come from a table built once per dictionary.
+    """
+    def __init__(self, skills):
+        self.skills = list(dict.fromkeys(skill.strip().lower() for skill in skills if skill.strip()))
+        self.columns = {skill: column for column, skill in enumerate(self.skills)}
+        alternation = self._trie_pattern(self.skills) if self.skills else '(?!)'
+        self.pattern = re.compile(r'(?<![a-z0-9])(?=(' + alternation + r')(?![a-z0-9]))')
+        # Skills that are a prefix of a longer skill ending at a word boundary inside it
+        self.nested = {}
+        for skill in self.skills:
+            prefixes = [skill[:end] for end in range(1, len(skill))
+                        if skill[:end] in self.columns and not re.match(r'[a-z0-9]', skill[end])]
+            if prefixes:
+                self.nested[skill] = prefixes
+    
+    @staticmethod
+    def _trie_pattern(words):
+        trie = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}  # End of a skill
+        
+        def build(node):
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            if '' in node:
+                # A skill ends here; prefer the longer skill and fall back to it
+                return f'(?:{pattern})?' if len(branches) == 1 else pattern + '?'
+            return pattern
+        
+        return build(trie)
+    
+    def _mentions(self, text):
+        for match in self.pattern.finditer(text):
+            skill = match.group(1)
+            yield skill
+            yield from self.nested.get(skill, ())
+    
+    def find(self, text):
+        """Return the skills mentioned in lowercased text, in dictionary order"""
+        return sorted(set(self._mentions(text)), key=self.columns.__getitem__)
+    
+    def find_columns(self, text):
+        """Return the dictionary columns of the skills mentioned in lowercased text"""
+        return sorted({self.columns[skill] for skill in self._mentions(text)})
+
+if SKILLS_FILE:
+    SKILLS_KEYWORDS = load_skills(SKILLS_FILE)
+skill_matcher = SkillMatcher(SKILLS_KEYWORDS)
+SKILLS_KEYWORDS = skill_matcher.skills
+SKILL_COLUMNS = skill_matcher.columns
+
+# Experience levels used by the registration and job posting forms
+EXPERIENCE_LEVELS = {
+    "0-1 years": 1,
+    "1-3 years": 2,
+    "3-5 years": 3,
+    "5-10 years": 4,
+    "10+ years": 5
+}
+
+def experience_code(experience):
+    """Encode an experience string as its level, 0 when empty or -1 when it is not a known level"""
+    if not experience:
+        return 0
+    return EXPERIENCE_LEVELS.get(experience, -1)
+
+# Education levels produced by the resume parser
+EDUCATION_LEVELS = ["Bachelor's Degree", "Master's Degree", "PhD", "Diploma"]
+
+# Resume words that decide the parsed education level
+EDUCATION_TERMS = ['bachelor', 'master', 'phd', 'degree', 'diploma', 'certification', 'mba', 'doctorate']
+
+# Resume words that decide whether the default education level is refined
+EDUCATION_KEYWORDS = ['bachelor', 'master', 'phd', 'degree', 'diploma', 'certification']
+
+# Years of experience, e.g. "5 years" or "3+ years of experience"
+EXPERIENCE_PATTERN = re.compile(r'(\d+)\+?\s*years?')
+
 # Helper functions for file upload and resume parsing
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 def save_resume(file):
     if file and allowed_file(file.filename):
-        # Generate unique filename
-        filename = secure_filename(file.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(file_path)
-        return unique_filename
+        return store_resume(file.stream, file.filename.rsplit('.', 1)[1].lower())
     return None
 
+def store_resume(stream, extension):
+    """Copy a resume into the upload folder; returns its stored filename"""
+    # Name the file by its content hash so identical uploads are stored once
+    tmp_path = os.path.join(app.config['UPLOAD_FOLDER'], f".upload-{uuid.uuid4().hex}")
+    digest = hashlib.sha256()
+    with open(tmp_path, 'wb') as out:
+        for chunk in iter(lambda: stream.read(64 * 1024), b''):
+            digest.update(chunk)
+            out.write(chunk)
+    
+    filename = f"{digest.hexdigest()}.{extension}"
+    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    if os.path.exists(file_path):
+        os.remove(tmp_path)
+        os.utime(file_path)  # Restart the garbage collection grace period
+    else:
+        os.replace(tmp_path, file_path)
+    return filename
+
+def resume_content_hash(filename):
+    """Content hash of a stored resume, or None for files saved before content addressing"""
+    stem = os.path.basename(filename).rsplit('.', 1)[0]
+    return stem if re.fullmatch(r'[0-9a-f]{64}', stem) else None
+
+def iter_pdf_text(file_path, max_pages=None):
+    """Yield the text of each PDF page, up to max_pages"""
+    import PyPDF2  # Parser modules load on first use, not when the app starts
+    
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page_number, page in enumerate(pdf_reader.pages):
+            if max_pages is not None and page_number >= max_pages:
+                break
+            yield page.extract_text() or ""
+
+def iter_docx_text(file_path):
+    """Yield the text of each DOCX paragraph"""
+    from docx import Document
+    
+    doc = Document(file_path)
+    for paragraph in doc.paragraphs:
+        yield paragraph.text + "\n"
+
 def extract_text_from_pdf(file_path):
     """Extract text from PDF file"""
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
+        return "".join(iter_pdf_text(file_path))
     except Exception as e:
         print(f"Error extracting PDF text: {e}")
         return ""
@@ -70,66 +391,74 @@ def extract_text_from_pdf(file_path):
 def extract_text_from_docx(file_path):
     """Extract text from DOCX file"""
     try:
-        doc = Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        return "".join(iter_docx_text(file_path))
     except Exception as e:
         print(f"Error extracting DOCX text: {e}")
         return ""
 
+def iter_resume_text(file_path, file_extension, max_pages=RESUME_MAX_PAGES, max_chars=RESUME_MAX_CHARS,
+                     time_budget=RESUME_PARSE_TIME_BUDGET):
+    """Yield resume text chunks until the page or character cap or the time budget is reached"""
+    if file_extension.lower() == 'pdf':
+        chunks = iter_pdf_text(file_path, max_pages)
+    elif file_extension.lower() in ['doc', 'docx']:
+        chunks = iter_docx_text(file_path)
+    else:
+        return
+    
+    deadline = time.monotonic() + time_budget
+    remaining = max_chars
+    extraction_seconds = 0.0  # Time spent producing chunks, not analysing them
+    started = time.perf_counter()
+    try:
+        for chunk in chunks:
+            extraction_seconds += time.perf_counter() - started
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
+            yield chunk
+            started = time.perf_counter()
+            if remaining <= 0 or time.monotonic() > deadline:
+                break
+    except Exception as e:
+        # Keep whatever was extracted before the document failed
+        print(f"Error extracting resume text: {e}")
+    finally:
+        chunks.close()
+        metrics.observe_stage('resume.extract', extraction_seconds)
+
+@timed('resume.parse')
 def parse_resume_content(file_path, file_extension):
     """Parse resume content and extract skills, experience, and other relevant information"""
     try:
-        # Extract text based on file type
-        if file_extension.lower() == 'pdf':
-            text = extract_text_from_pdf(file_path)
-        elif file_extension.lower() in ['doc', 'docx']:
-            text = extract_text_from_docx(file_path)
-        else:
-            return {}
+        found_skills = set()
+        experience_years = 0
+        education_terms = set()
+        text_parts = []
+        tail = ""
+        
+        # Scan the text chunk by chunk as it is extracted
+        for chunk in iter_resume_text(file_path, file_extension):
+            chunk = chunk.lower()
+            text_parts.append(chunk)
+            # Prepend the end of the previous chunk so terms split across chunks are found
+            window = tail + chunk
+            tail = window[-RESUME_CHUNK_OVERLAP:].split(maxsplit=1)  # Start at a word boundary
+            tail = tail[1] if len(tail) == 2 else ""
+            
+            # Extract skills (common technical skills)
+            found_skills.update(skill_matcher.find(window))
+            
+            # Extract experience level
+            matches = EXPERIENCE_PATTERN.findall(window)
+            if matches:
+                experience_years = max(experience_years, max(int(match) for match in matches))
+            
+            education_terms.update(term for term in EDUCATION_TERMS if term in window)
         
+        text = "".join(text_parts)
         if not text:
             return {}
-        
-        # Clean and preprocess text
-        text = text.lower()
-        
-        # Extract skills (common technical skills)
-        skills_keywords = [
-            'python', 'javascript', 'java', 'react', 'angular', 'vue', 'node.js', 'django', 'flask',
-            'sql', 'postgresql', 'mysql', 'mongodb', 'aws', 'azure', 'docker', 'kubernetes',
-            'git', 'github', 'machine learning', 'ai', 'data science', 'pandas', 'numpy',
-            'html', 'css', 'bootstrap', 'jquery', 'php', 'laravel', 'spring', 'express',
-            'typescript', 'c++', 'c#', '.net', 'ruby', 'rails', 'go', 'rust', 'swift',
-            'android', 'ios', 'react native', 'flutter', 'xamarin', 'unity', 'unreal',
-            'photoshop', 'illustrator', 'figma', 'sketch', 'adobe', 'ui/ux', 'design',
-            'project management', 'agile', 'scrum', 'devops', 'ci/cd', 'jenkins',
-            'linux', 'windows', 'macos', 'api', 'rest', 'graphql', 'microservices'
-        ]
-        
-        found_skills = []
-        for skill in skills_keywords:
-            if skill in text:
-                found_skills.append(skill)
-        
-        # Extract experience level
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'(\d+)\+?\s*years?\s*(?:in\s*)?',
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?'
-        ]
-        
-        experience_years = 0
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                try:
-                    years = max([int(match) for match in matches])
-                    experience_years = max(experience_years, years)
-                except:
-                    continue
+        found_skills = sorted(found_skills, key=SKILL_COLUMNS.__getitem__)
         
         # Determine experience level
         if experience_years >= 5:
@@ -142,17 +471,14 @@ def parse_resume_content(file_path, file_extension):
             experience_level = "0-1 years"
         
         # Extract education
-        education_keywords = ['bachelor', 'master', 'phd', 'degree', 'diploma', 'certification']
         education = "Bachelor's Degree"  # Default
-        for edu in education_keywords:
-            if edu in text:
-                if 'master' in text or 'mba' in text:
-                    education = "Master's Degree"
-                elif 'phd' in text or 'doctorate' in text:
-                    education = "PhD"
-                elif 'diploma' in text:
-                    education = "Diploma"
-                break
+        if any(edu in education_terms for edu in EDUCATION_KEYWORDS):
+            if 'master' in education_terms or 'mba' in education_terms:
+                education = "Master's Degree"
+            elif 'phd' in education_terms or 'doctorate' in education_terms:
+                education = "PhD"
+            elif 'diploma' in education_terms:
+                education = "Diploma"
         
         return {
             'extracted_skills': found_skills,
@@ -182,17 +508,43 @@ class User(db.Model):
     parsed_skills = db.Column(db.Text)  # JSON string of extracted skills
     parsed_experience = db.Column(db.String(50))  # Extracted experience level
     parsed_education = db.Column(db.String(100))  # Extracted education
-    resume_text = db.Column(db.Text)  # Full resume text for analysis
+    resume_text = db.mapped_column(db.Text, deferred=True)  # Full resume text, loaded only on access
+    resume_excerpt = db.column_property(db.func.substr(resume_text, 1, 1000), deferred=True)  # Part used for matching
+    parse_status = db.Column(db.String(20))  # pending, done or failed; None without a resume
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def __repr__(self):
         return f'<User {self.username}>'
 
+class ParsedResume(db.Model):
+    content_hash = db.Column(db.String(64), primary_key=True)  # SHA-256 of the stored resume
+    parser_version = db.Column(db.String(40), nullable=False)
+    parsed_data = db.Column(db.Text, nullable=False)  # JSON result of parse_resume_content
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ParsedResume {self.content_hash[:12]}>'
+
+class ResumeParseTask(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    file_path = db.Column(db.String(255), nullable=False)
+    file_extension = db.Column(db.String(10), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending', index=True)  # pending, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ResumeParseTask {self.id} {self.status}>'
+
 class Job(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     company = db.Column(db.String(100), nullable=False)
-    description = db.Column(db.Text, nullable=False)
+    description = db.mapped_column(db.Text, nullable=False, deferred=True)  # Loaded only on access
+    description_preview = db.column_property(db.func.substr(description, 1, 200))  # Enough for job cards and APIs
     required_skills = db.Column(db.Text, nullable=False)
     experience_required = db.Column(db.String(50), nullable=False)
     location = db.Column(db.String(100), nullable=False)
@@ -202,145 +554,1535 @@ class Job(db.Model):
     contact_email = db.Column(db.String(120), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Newest-first keyset pagination, optionally filtered on one column
+    __table_args__ = (
+        db.Index('ix_job_created_at_id', 'created_at', 'id'),
+        db.Index('ix_job_location_created_at_id', 'location', 'created_at', 'id'),
+        db.Index('ix_job_job_type_created_at_id', 'job_type', 'created_at', 'id'),
+        db.Index('ix_job_experience_required_created_at_id', 'experience_required', 'created_at', 'id'),
+        db.Index('ix_job_posted_by_created_at_id', 'posted_by', 'created_at', 'id'),
+    )
+    
     def __repr__(self):
         return f'<Job {self.title}>'
 
+class Application(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
+    employer = db.Column(db.String(100), nullable=False)  # Copy of job.posted_by for the employer feed
+    status = db.Column(db.String(20), nullable=False, default='New')  # One of APPLICATION_STATUSES
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'job_id', name='uq_application_user_job'),
+        db.Index('ix_application_job_id_status', 'job_id', 'status'),
+        db.Index('ix_application_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_application_employer_created_at_id', 'employer', 'created_at', 'id'),
+    )
+    
+    def __repr__(self):
+        return f'<Application {self.user_id}->{self.job_id} {self.status}>'
+
+class PortalStat(db.Model):
+    """Materialized dashboard counter, updated in the transaction that changes what it counts"""
+    name = db.Column(db.String(150), primary_key=True)  # users, jobs, jobs:<employer>, applications:<employer>[:<status>]
+    value = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<PortalStat {self.name}={self.value}>'
+
+STATS_BUILT = '_built'  # Marker counter written only by refresh_stats
+
+def _stat_upsert():
+    """Upsert adding :value to counter :name, which does nothing until refresh_stats has built the counters"""
+    built = db.select(PortalStat.name).where(PortalStat.name == STATS_BUILT).exists()
+    row = db.select(db.bindparam('name', type_=db.String), db.bindparam('value', type_=db.Integer)).where(built)
+    statement = sqlite_insert(PortalStat.__table__).from_select(['name', 'value'], row)
+    return statement.on_conflict_do_update(
+        index_elements=[PortalStat.name], set_={'value': PortalStat.value + statement.excluded.value}
+    )
+
+def increment_stat(name, amount=1):
+    """Add amount to a counter as part of the current transaction"""
+    db.session.execute(_stat_upsert(), {'name': name, 'value': amount})
+
+def increment_stats(amounts):
+    """Add a name -> amount mapping to the counters in one statement, for bulk loads"""
+    db.session.connection().execute(_stat_upsert(), [{'name': name, 'value': amount} for name, amount in amounts.items()])
+
+def refresh_stats():
+    """Recompute every counter with aggregate queries"""
+    counts = {
+        'users': db.session.query(db.func.count(User.id)).scalar(),
+        'jobs': db.session.query(db.func.count(Job.id)).scalar(),
+        STATS_BUILT: 1
+    }
+    for employer, count in db.session.query(Job.posted_by, db.func.count(Job.id)).group_by(Job.posted_by):
+        counts[f'jobs:{employer}'] = count
+    application_counts = (db.session.query(Application.employer, Application.status, db.func.count(Application.id))
+                          .group_by(Application.employer, Application.status))
+    for employer, status, count in application_counts:
+        counts[f'applications:{employer}'] = counts.get(f'applications:{employer}', 0) + count
+        counts[f'applications:{employer}:{status}'] = count
+    PortalStat.query.delete()
+    db.session.add_all(PortalStat(name=name, value=value) for name, value in counts.items())
+    db.session.commit()
+
+def get_stats(*names):
+    """Read counters by name, building them on first use; missing ones are 0"""
+    values = dict(db.session.query(PortalStat.name, PortalStat.value).filter(PortalStat.name.in_(names + (STATS_BUILT,))))
+    if STATS_BUILT not in values:
+        refresh_stats()
+        return get_stats(*names)
+    return {name: values.get(name, 0) for name in names}
+
+# Columns added to tables that databases created by earlier versions already have
+SCHEMA_COLUMNS = [
+    ('user', 'parse_status', "VARCHAR(20)"),
+]
+
+def upgrade_database():
+    """Add the columns and indexes create_all leaves out of tables that already exist"""
+    for table, column, column_type in SCHEMA_COLUMNS:
+        columns = {row[1] for row in db.session.execute(db.text(f'PRAGMA table_info("{table}")'))}
+        if column not in columns:
+            db.session.execute(db.text(f'ALTER TABLE "{table}" ADD COLUMN {column} {column_type}'))
+    # Such as the composite indexes keyset pagination on the job table relies on
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            db.session.execute(CreateIndex(index, if_not_exists=True))
+    db.session.commit()
+
+# Full-text job search: an SQLite FTS5 index over the job table, kept in sync by triggers
+JOB_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS job_fts USING fts5("
+    "title, company, description, required_skills, content='job', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    # Rank title and skills matches above description matches
+    "INSERT INTO job_fts(job_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0, 5.0)')",
+    "CREATE TRIGGER IF NOT EXISTS job_fts_insert AFTER INSERT ON job BEGIN "
+    "INSERT INTO job_fts(rowid, title, company, description, required_skills) "
+    "VALUES (new.id, new.title, new.company, new.description, new.required_skills); END",
+    "CREATE TRIGGER IF NOT EXISTS job_fts_delete AFTER DELETE ON job BEGIN "
+    "INSERT INTO job_fts(job_fts, rowid, title, company, description, required_skills) "
+    "VALUES ('delete', old.id, old.title, old.company, old.description, old.required_skills); END",
+    "CREATE TRIGGER IF NOT EXISTS job_fts_update AFTER UPDATE ON job BEGIN "
+    "INSERT INTO job_fts(job_fts, rowid, title, company, description, required_skills) "
+    "VALUES ('delete', old.id, old.title, old.company, old.description, old.required_skills); "
+    "INSERT INTO job_fts(rowid, title, company, description, required_skills) "
+    "VALUES (new.id, new.title, new.company, new.description, new.required_skills); END",
+]
+
+@event.listens_for(Job.__table__, 'after_create')
+def create_job_search_index(target, connection, **kw):
+    for statement in JOB_SEARCH_DDL:
+        connection.exec_driver_sql(statement)
+
+def ensure_job_search_index():
+    """Create and fill the search index of a database created before it existed"""
+    exists = db.session.execute(db.text("SELECT 1 FROM sqlite_master WHERE name = 'job_fts'")).first()
+    if exists is None:
+        for statement in JOB_SEARCH_DDL:
+            db.session.execute(db.text(statement))
+        db.session.execute(db.text("INSERT INTO job_fts(job_fts) VALUES ('rebuild')"))
+        db.session.commit()
+
 # AI Recommendation System
+class LRUCache:
+    """Thread-safe least-recently-used cache with hit/miss counters"""
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._data), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
+
+# Characters preprocess_text drops; other Unicode digits are removed by DIGITS_PATTERN
+STRIP_TABLE = str.maketrans('', '', string.punctuation + string.digits)
+DIGITS_PATTERN = re.compile(r'\d+')
+
+# Per-row arrays stored next to the job vectors in every index segment
+SEGMENT_ARRAYS = ('job_ids', 'job_experience', 'job_education')
+
 class JobRecommendationEngine:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
-        self.job_vectors = None
-        self.jobs_data = None
+    def __init__(self, index_folder=INDEX_FOLDER, mode=RECOMMENDATION_MODE):
+        self.index_folder = index_folder
+        self.mode = mode
+        self.vectorizer = None  # Fitted with the base segment
+        self.ann = None  # Dense embedding model and IVF lists of the base segment, in ann mode
+        self.index_version = None  # Persisted version the base segment was loaded from
+        self.base = None  # Fitted segment, memory-mapped from the persisted index
+        self.delta = None  # Segment of rows appended since the last refit
+        self.job_rows = {}  # Job id -> row of its live vector
+        self.tombstones = set()  # Rows of edited or deleted jobs
+        self._fitted_rows = 0
+        self._changed_rows = 0
+        self._fitted_coverage = 1.0
+        self._new_tokens = 0
+        self._new_known_tokens = 0
+        self._journal_offset = 0  # Bytes of the change journal applied to this index
+        self._last_refresh = 0.0
+        # Readers only ever load this reference; writers build a new snapshot under
+        # the lock and replace it in one assignment, so readers never block.
+        self._snapshot = None
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._compaction_requested = False  # Set on drift; the next background pass refits
+        self._last_compaction = time.monotonic()
+        self._compaction_thread = None
+        # Keyed by profile hash and index version, so edits and rebuilds invalidate entries
+        self.profile_vector_cache = LRUCache(RECOMMENDATION_CACHE_SIZE)
+        self.recommendation_cache = LRUCache(RECOMMENDATION_CACHE_SIZE)
+        self.candidates = CandidateIndex(self, index_folder)
         
     def preprocess_text(self, text):
         """Clean and preprocess text for better matching"""
         if not text:
             return ""
-        text = text.lower()
-        text = re.sub(r'\d+', '', text)  # Remove numbers
-        text = text.translate(str.maketrans('', '', string.punctuation))
+        text = text.lower().translate(STRIP_TABLE)  # Remove punctuation and numbers
+        if not text.isascii():
+            text = DIGITS_PATTERN.sub('', text)
         return text
     
+    def _job_text(self, job):
+        # Combine title, description, and required skills for better matching
+        return self.preprocess_text(f"{job.title} {job.description} {job.required_skills}")
+    
+    def _job_rows(self):
+        """Query the job columns the index is built from, as rows"""
+        return db.session.query(Job.id, Job.title, Job.description, Job.required_skills, Job.experience_required)
+    
+    def _job_features(self, job):
+        """Precompute the fields the match bonuses need for one job"""
+        required_skills = (job.required_skills or "").lower()
+        description = (job.description or "").lower()
+        return (
+            experience_code(job.experience_required),
+            skill_matcher.find_columns(required_skills),
+            [level.lower() in description for level in EDUCATION_LEVELS]
+        )
+    
+    def _segment(self, job_ids, vectors, features, embeddings=None):
+        """Bundle job vectors with the per-row arrays used for scoring"""
+        experience, skills, education = zip(*features) if features else ((), (), ())
+        skills_indptr = np.cumsum([0] + [len(columns) for columns in skills])
+        skills_indices = np.fromiter((column for columns in skills for column in columns),
+                                     dtype=np.int32, count=skills_indptr[-1])
+        return {
+            'vectors': vectors,
+            'job_ids': np.array(job_ids, dtype=np.int32),
+            'job_experience': np.array(experience, dtype=np.int8),
+            'job_skills': self._skills_matrix(skills_indices, skills_indptr),
+            'job_education': np.array(education, dtype=bool).reshape(len(features), len(EDUCATION_LEVELS)),
+            **({'embeddings': embeddings} if embeddings is not None else {})
+        }
+    
+    def _skills_matrix(self, indices, indptr):
+        """Sparse rows x SKILLS_KEYWORDS matrix of the skills each job requires"""
+        from scipy import sparse
+        
+        return sparse.csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr),
+                                 shape=(len(indptr) - 1, len(SKILLS_KEYWORDS)))
+    
+    def _vocabulary_coverage(self, vectorizer, texts):
+        """Count tokens of texts and how many of them are in the fitted vocabulary"""
+        analyzer = vectorizer.build_analyzer()
+        vocabulary = vectorizer.vocabulary_
+        total = known = 0
+        for text in texts:
+            tokens = analyzer(text)
+            total += len(tokens)
+            known += sum(1 for token in tokens if token in vocabulary)
+        return total, known
+    
+    @timed('index.update_job_vectors')
     def update_job_vectors(self):
-        """Update job vectors when new jobs are added"""
-        jobs = Job.query.all()
-        if not jobs:
+        """Refit the vectorizer on the whole catalog, persist it and load the new version"""
+        # Changes journaled before the query are part of it; later ones are replayed
+        journal_offset = self._journal_size()
+        # Only ids, texts and compact features are kept; no ORM objects or raw descriptions
+        job_ids, job_data, features = [], [], []
+        with timed('index.load_jobs'):
+            for job in self._job_rows().order_by(Job.id).yield_per(INDEX_BUILD_CHUNK):
+                job_ids.append(job.id)
+                job_data.append(self._job_text(job))
+                features.append(self._job_features(job))
+        if not job_ids:
+            with self._lock:
+                self.base = None
+                self.delta = None
+                self.index_version = None
+                self.job_rows = {}
+                self.tombstones = set()
+                self._changed_rows = 0
+                self._journal_offset = journal_offset
+                self._publish()
             return
-            
-        job_data = []
-        for job in jobs:
-            # Combine title, description, and required skills for better matching
-            combined_text = f"{job.title} {job.description} {job.required_skills}"
-            job_data.append(self.preprocess_text(combined_text))
         
-        self.jobs_data = jobs
-        self.job_vectors = self.vectorizer.fit_transform(job_data)
+        from sklearn.feature_extraction.text import TfidfVectorizer  # Imported on first fit, not at startup
+        
+        with timed('index.fit'):
+            vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
+            vectors = vectorizer.fit_transform(job_data)
+            total, known = self._vocabulary_coverage(vectorizer, job_data)
+        ann = embeddings = None
+        if self.mode == 'ann':
+            with timed('index.fit_ann'):
+                ann, embeddings = self._fit_ann(job_data)
+        segment = self._segment(job_ids, vectors, features, embeddings)
+        with timed('index.save'):
+            version = self._save_index(vectorizer, segment, {
+                'journal_offset': journal_offset,
+                'coverage': known / total if total else 1.0
+            }, ann)
+        
+        loaded = self._load_index(version)
+        if loaded is None:
+            raise RuntimeError(f"Job index version {version} could not be loaded")
+        with self._lock:
+            self._install(*loaded)
+            self._sync_journal()
+            self._publish()
     
-    def get_recommendations(self, user, top_n=5):
-        """Get job recommendations for a user based on their skills and resume content"""
-        if self.job_vectors is None:
+    # Approximate mode: TF-IDF over a wide vocabulary projected to dense vectors by
+    # truncated SVD (LSA), searched through an inverted file of k-means lists.
+    def _fit_ann(self, job_data):
+        """Fit the embedding model and IVF lists; returns them and the job embeddings"""
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        vectorizer = TfidfVectorizer(stop_words='english', max_features=ANN_MAX_FEATURES, sublinear_tf=True)
+        tfidf = vectorizer.fit_transform(job_data)
+        dimensions = max(1, min(ANN_DIMENSIONS, tfidf.shape[0], tfidf.shape[1] - 1))
+        svd = TruncatedSVD(n_components=dimensions, random_state=0).fit(tfidf)
+        ann = {'vectorizer': vectorizer, 'components': svd.components_.astype(np.float32)}
+        embeddings = self._embed(ann, job_data)
+        
+        # Inverted file: about sqrt(n) lists, each holding the rows nearest its centroid
+        n_lists = max(1, int(np.sqrt(len(job_data))))
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, n_init=3, random_state=0).fit(embeddings)
+        centroids = kmeans.cluster_centers_.astype(np.float32)
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        assignment = np.argmax(embeddings @ centroids.T, axis=1)
+        ann.update(centroids=centroids,
+                   order=np.argsort(assignment, kind='stable').astype(np.int64),
+                   offsets=np.searchsorted(np.sort(assignment), np.arange(n_lists + 1)).astype(np.int64))
+        return ann, embeddings
+    
+    def _embed(self, ann, texts):
+        """Unit-length float32 embeddings of preprocessed texts"""
+        embeddings = np.asarray(ann['vectorizer'].transform(texts) @ ann['components'].T, dtype=np.float32)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
+    
+    def _ann_search(self, index, query):
+        """Rows of the probed IVF lists plus every delta row, with their similarity to query"""
+        ann = index['ann']
+        probes = min(ANN_PROBES, len(ann['centroids']))
+        lists = np.argpartition(ann['centroids'] @ query, -probes)[-probes:]
+        rows = np.concatenate([ann['order'][ann['offsets'][i]:ann['offsets'][i + 1]] for i in lists])
+        scores = index['base']['embeddings'][rows] @ query
+        if index['delta'] is not None:
+            base_rows = index['base']['vectors'].shape[0]
+            rows = np.concatenate([rows, base_rows + np.arange(len(index['delta']['embeddings']))])
+            scores = np.concatenate([scores, index['delta']['embeddings'] @ query])
+        return rows, scores.astype(np.float64)
+    
+    def _query_vectors(self, index, profiles):
+        """TF-IDF rows, or dense embeddings in ann mode, of preprocessed profiles"""
+        if index['ann'] is not None:
+            return self._embed(index['ann'], profiles)
+        return index['vectorizer'].transform(profiles)
+    
+    def _scores(self, index, query_vectors):
+        """(rows, scores) per query; rows is None when every index row was scored"""
+        if index['ann'] is not None:
+            return [self._ann_search(index, query) for query in query_vectors]
+        return [(None, scores) for scores in self._similarity(index, query_vectors)]
+    
+    def ensure_index(self):
+        """Load the persisted index, refitting the catalog if there is none yet"""
+        if self._snapshot is not None:
+            return
+        with self._lock:
+            if self._snapshot is None:
+                self._refresh()
+        if self._snapshot is None:
             self.update_job_vectors()
+    
+    # Persisted index: <index_folder>/v<version>/ holds meta.json (format, vocabulary,
+    # scoring tables) and one .npy file per array; CURRENT names the live version.
+    def _version_path(self, version):
+        return os.path.join(self.index_folder, f"v{version}")
+    
+    def _read_current_version(self):
+        try:
+            with open(os.path.join(self.index_folder, 'CURRENT')) as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+    
+    def _save_index(self, vectorizer, segment, meta, ann=None):
+        """Write a new index version and atomically point CURRENT at it"""
+        os.makedirs(self.index_folder, exist_ok=True)
+        previous = self._read_current_version()
+        version = time.time_ns()
+        tmp_path = os.path.join(self.index_folder, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp_path)
+        
+        vectors = segment['vectors']
+        skills = segment['job_skills']
+        arrays = {name: segment[name] for name in SEGMENT_ARRAYS}
+        arrays.update(data=vectors.data, indices=vectors.indices, indptr=vectors.indptr,
+                      job_skills_indices=skills.indices, job_skills_indptr=skills.indptr,
+                      idf=vectorizer.idf_)
+        if ann is not None:
+            arrays.update(embeddings=segment['embeddings'], ann_idf=ann['vectorizer'].idf_,
+                          ann_components=ann['components'], ann_centroids=ann['centroids'],
+                          ann_order=ann['order'], ann_offsets=ann['offsets'])
+            meta = dict(meta, ann_vocabulary={term: int(column)
+                                              for term, column in ann['vectorizer'].vocabulary_.items()})
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump(dict(meta,
+                           format=INDEX_FORMAT,
+                           version=version,
+                           shape=list(vectors.shape),
+                           vocabulary={term: int(column) for term, column in vectorizer.vocabulary_.items()},
+                           skills=SKILLS_KEYWORDS,
+                           education=EDUCATION_LEVELS,
+                           created_at=datetime.utcnow().isoformat()), f)
+        os.rename(tmp_path, self._version_path(version))
+        
+        current_tmp = os.path.join(self.index_folder, f".CURRENT-{uuid.uuid4().hex}")
+        with open(current_tmp, 'w') as f:
+            f.write(str(version))
+        os.replace(current_tmp, os.path.join(self.index_folder, 'CURRENT'))
+        
+        # Keep the previous version for workers that have not switched yet
+        for name in os.listdir(self.index_folder):
+            if name.startswith('v') and name[1:] not in (str(version), str(previous)):
+                shutil.rmtree(os.path.join(self.index_folder, name), ignore_errors=True)
+        return version
+    
+    def _load_index(self, version):
+        """Memory-map an index version; returns None if it is missing or incompatible"""
+        from scipy import sparse
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        path = self._version_path(version)
+        try:
+            with open(os.path.join(path, 'meta.json')) as f:
+                meta = json.load(f)
+            if (meta['format'] != INDEX_FORMAT or meta['skills'] != SKILLS_KEYWORDS
+                    or meta['education'] != EDUCATION_LEVELS):
+                return None
+            # An exact index has no embeddings; ann mode refits rather than use it
+            if self.mode == 'ann' and 'ann_vocabulary' not in meta:
+                return None
             
-        if self.job_vectors is None or len(self.jobs_data) == 0:
-            return []
+            def load(name):
+                return np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+            
+            vectors = sparse.csr_matrix((load('data'), load('indices'), load('indptr')),
+                                        shape=tuple(meta['shape']), copy=False)
+            segment = dict({name: load(name) for name in SEGMENT_ARRAYS}, vectors=vectors,
+                           job_skills=self._skills_matrix(load('job_skills_indices'), load('job_skills_indptr')))
+            vectorizer = TfidfVectorizer(stop_words='english', vocabulary=meta['vocabulary'])
+            vectorizer.idf_ = np.load(os.path.join(path, 'idf.npy'))
+            ann = None
+            if self.mode == 'ann':
+                segment['embeddings'] = load('embeddings')
+                ann_vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True,
+                                                 vocabulary=meta['ann_vocabulary'])
+                ann_vectorizer.idf_ = np.load(os.path.join(path, 'ann_idf.npy'))
+                ann = {'vectorizer': ann_vectorizer, 'components': load('ann_components'),
+                       'centroids': load('ann_centroids'), 'order': load('ann_order'),
+                       'offsets': load('ann_offsets')}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading job index version {version}: {e}")
+            return None
+        return vectorizer, segment, version, meta['journal_offset'], meta['coverage'], ann
+    
+    def _install(self, vectorizer, segment, version, journal_offset, coverage, ann):
+        """Make a loaded index live; called under the lock"""
+        self.vectorizer = vectorizer
+        self.ann = ann
+        self.base = segment
+        self.delta = None
+        self.index_version = version
+        self.job_rows = {int(job_id): row for row, job_id in enumerate(segment['job_ids'])}
+        self.tombstones = set()
+        self._fitted_rows = len(self.job_rows)
+        self._changed_rows = 0
+        self._fitted_coverage = coverage
+        self._new_tokens = 0
+        self._new_known_tokens = 0
+        self._journal_offset = journal_offset
+    
+    def _refresh(self):
+        """Switch to a newer persisted version and apply journaled changes; called under the lock"""
+        self._last_refresh = time.monotonic()
+        version = self._read_current_version()
+        if version is not None and version != self.index_version:
+            loaded = self._load_index(version)
+            if loaded is not None:
+                self._install(*loaded)
+        self._sync_journal()
+        self._publish()
+    
+    # Change journal: every worker appends "add <id>" / "remove <id>" lines and
+    # replays the lines written by the others, so posts reach all workers
+    # without waiting for the next refit.
+    def _journal_path(self):
+        return os.path.join(self.index_folder, 'journal.log')
+    
+    def _journal_size(self):
+        try:
+            return os.path.getsize(self._journal_path())
+        except OSError:
+            return 0
+    
+    def _log_change(self, action, job_id):
+        os.makedirs(self.index_folder, exist_ok=True)
+        with open(self._journal_path(), 'a') as f:
+            f.write(f"{action} {job_id}\n")
+    
+    def _sync_journal(self):
+        """Apply journal lines past our offset; called under the lock"""
+        if self._journal_size() <= self._journal_offset:
+            return
+        with open(self._journal_path(), 'rb') as f:
+            f.seek(self._journal_offset)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1  # Ignore a partially written last line
+        self._journal_offset += end
+        # A burst of changes is applied in one pass; the last action per job wins
+        actions = {}
+        for line in chunk[:end].decode().splitlines():
+            action, job_id = line.split()
+            actions[int(job_id)] = action
+        for job_id in actions:
+            self._tombstone_job(job_id)
+        added = [job_id for job_id, action in actions.items() if action == 'add']
+        if added and self.base is not None:
+            jobs = self._job_rows().filter(Job.id.in_(added)).order_by(Job.id).all()
+            self._append_jobs(jobs)
+    
+    def add_job(self, job):
+        """Index a new or edited job against the current vocabulary without refitting"""
+        self._log_change('add', job.id)
+        self._request_refresh()
+    
+    def remove_job(self, job_id):
+        """Tombstone a deleted job so it is no longer recommended"""
+        self._log_change('remove', job_id)
+        self._request_refresh()
+    
+    def _append_jobs(self, jobs):
+        """Vectorize jobs into a new delta segment; called under the lock"""
+        if not jobs:
+            return
+        texts = [self._job_text(job) for job in jobs]
+        first_row = self._row_count()
+        for row, job in enumerate(jobs, first_row):
+            self.job_rows[job.id] = row
+        self._changed_rows += len(jobs)
+        embeddings = self._embed(self.ann, texts) if self.ann is not None else None
+        appended = self._segment([job.id for job in jobs], self.vectorizer.transform(texts),
+                                 [self._job_features(job) for job in jobs], embeddings)
+        self.delta = appended if self.delta is None else self._stack(self.delta, appended)
+        total, known = self._vocabulary_coverage(self.vectorizer, texts)
+        self._new_tokens += total
+        self._new_known_tokens += known
+    
+    def _tombstone_job(self, job_id):
+        row = self.job_rows.pop(job_id, None)
+        if row is not None:
+            self.tombstones.add(row)
+            self._changed_rows += 1
+    
+    def _row_count(self):
+        rows = self.base['vectors'].shape[0] if self.base is not None else 0
+        if self.delta is not None:
+            rows += self.delta['vectors'].shape[0]
+        return rows
+    
+    def _stack(self, *segments):
+        """Concatenate the rows of segments with the same arrays"""
+        from scipy import sparse
         
+        return {
+            name: (sparse.vstack([segment[name] for segment in segments], format='csr')
+                   if sparse.issparse(segments[0][name])
+                   else np.concatenate([segment[name] for segment in segments]))
+            for name in segments[0]
+        }
+    
+    def _needs_compaction(self):
+        if self._changed_rows == 0:
+            return False
+        if self._changed_rows >= max(1, self._fitted_rows) * INDEX_GROWTH_THRESHOLD:
+            return True
+        if self._new_tokens:
+            new_coverage = self._new_known_tokens / self._new_tokens
+            return self._fitted_coverage - new_coverage > INDEX_DRIFT_THRESHOLD
+        return False
+    
+    def _request_refresh(self):
+        """Wake the background thread to apply journaled changes and follow new versions"""
+        thread = self._compaction_thread
+        if thread is None or not thread.is_alive():
+            self.start_compaction_worker()
+        self._wakeup.set()
+    
+    def start_compaction_worker(self, interval=INDEX_COMPACTION_INTERVAL):
+        """Start the background thread that applies changes and refits periodically or on drift"""
+        with self._lock:
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+            self._compaction_thread = threading.Thread(
+                target=self._compaction_loop, args=(interval,),
+                name='job-index-compaction', daemon=True
+            )
+            self._compaction_thread.start()
+    
+    def _compaction_loop(self, interval):
+        while True:
+            # Wake-ups that arrive while a pass runs coalesce into the next pass
+            self._wakeup.wait(max(0.0, self._last_compaction + interval - time.monotonic()))
+            self._wakeup.clear()
+            try:
+                with app.app_context():
+                    with self._lock:
+                        self._refresh()
+                        if self._needs_compaction():
+                            self._compaction_requested = True
+                        compaction_due = (self._compaction_requested
+                                          or time.monotonic() - self._last_compaction >= interval)
+                        refit = compaction_due and self._changed_rows > 0
+                    stale_candidates = self.candidates.is_stale(self._snapshot)
+                    if not compaction_due and not stale_candidates:
+                        continue
+                    if compaction_due:
+                        self._compaction_requested = False
+                        self._last_compaction = time.monotonic()
+                    rebuild_candidates = compaction_due and self.candidates.needs_compaction()
+                    if not refit and not rebuild_candidates and not stale_candidates:
+                        continue
+                    # Only one process refits; the others pick up its version
+                    with self._compaction_lock() as acquired:
+                        if acquired and refit:
+                            self.update_job_vectors()
+                        # Build candidates for the new vocabulary once, here, if any worker ranks candidates
+                        if acquired and (rebuild_candidates or self.candidates.is_stale(self._snapshot)):
+                            self.candidates.rebuild(self._snapshot)
+            except Exception as e:
+                print(f"Error compacting job index: {e}")
+    
+    @contextmanager
+    def _compaction_lock(self, blocking=False):
+        if fcntl is None:
+            yield True
+            return
+        os.makedirs(self.index_folder, exist_ok=True)
+        with open(os.path.join(self.index_folder, 'compaction.lock'), 'w') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def _publish(self):
+        """Replace the snapshot readers see with the current state; called under the lock"""
+        if self.base is None:
+            self._snapshot = None
+            return
+        self._snapshot = {
+            'version': self.index_version,
+            'generation': self._journal_offset,  # Advances with every applied change
+            'vectorizer': self.vectorizer,
+            'ann': self.ann,
+            'base': self.base,
+            'delta': self.delta,
+            'tombstones': np.fromiter(self.tombstones, dtype=np.int64, count=len(self.tombstones))
+        }
+    
+    def _index_snapshot(self):
+        """The live index snapshot; never waits on a refresh or refit in progress"""
+        if time.monotonic() - self._last_refresh >= INDEX_RELOAD_INTERVAL:
+            self._request_refresh()
+        return self._snapshot
+    
+    def _similarity(self, index, query_vectors):
+        """Cosine similarity of query rows against every base and delta row"""
+        # TF-IDF rows are L2-normalised, so the dot product is the cosine similarity
+        segments = [index['base']] + ([index['delta']] if index['delta'] is not None else [])
+        return np.hstack([(segment['vectors'] @ query_vectors.T).T.toarray() for segment in segments])
+    
+    def _take(self, index, name, rows):
+        """Gather a per-row array at index rows spanning the base and delta segments"""
+        base = index['base'][name]
+        if index['delta'] is None:
+            return base[rows]
+        delta = index['delta'][name]
+        in_base = rows < len(base)
+        values = np.empty((len(rows),) + base.shape[1:], dtype=np.result_type(base, delta))
+        values[in_base] = base[rows[in_base]]
+        values[~in_base] = delta[rows[~in_base] - len(base)]
+        return values
+    
+    def _skill_matches(self, index, candidates, columns, name='job_skills'):
+        """Count how many of the given skill columns each candidate row has"""
+        counts = np.zeros(len(candidates))
+        offset = 0
+        for segment in [index['base']] + ([index['delta']] if index['delta'] is not None else []):
+            rows = segment[name].shape[0]
+            in_segment = (candidates >= offset) & (candidates < offset + rows)
+            if in_segment.any():
+                skills = segment[name][candidates[in_segment] - offset][:, columns]
+                counts[in_segment] = np.asarray(skills.sum(axis=1)).ravel()
+            offset += rows
+        return counts
+    
+    def _user_profile(self, user, parsed_skills):
+        """Build the preprocessed profile text that is matched against jobs"""
         # Combine user skills with parsed resume skills
         user_skills = user.skills
-        if user.parsed_skills:
-            try:
-                import json
-                parsed_skills = json.loads(user.parsed_skills)
-                if parsed_skills:
-                    user_skills += ", " + ", ".join(parsed_skills)
-            except:
-                pass
+        if parsed_skills:
+            user_skills += ", " + ", ".join(parsed_skills)
         
         # Add resume text for better matching
-        resume_text = ""
-        if user.resume_text:
-            resume_text = user.resume_text[:1000]  # Limit resume text length
+        resume_text = user.resume_excerpt or ""  # First 1000 characters of the resume
         
         # Create comprehensive user profile
         user_profile = f"{user_skills} {resume_text} {user.experience} {user.education}"
-        user_profile = self.preprocess_text(user_profile)
-        user_vector = self.vectorizer.transform([user_profile])
+        return self.preprocess_text(user_profile)
+    
+    def _parsed_skills(self, user):
+        if not user.parsed_skills:
+            return []
+        try:
+            return json.loads(user.parsed_skills) or []
+        except (ValueError, TypeError):
+            return []
+    
+    def _profile_hash(self, user):
+        """Hash every user field that affects the profile vector or the bonuses"""
+        fields = [user.skills, user.parsed_skills, user.resume_excerpt or "", user.experience,
+                  user.education, user.parsed_experience, user.parsed_education]
+        return hashlib.sha1(json.dumps(fields).encode()).hexdigest()
+    
+    def get_recommendations(self, user, top_n=5):
+        """Get job recommendations for a user based on their skills and resume content"""
+        with timed('recommend.snapshot'):
+            self.ensure_index()
+            index = self._index_snapshot()
+        if index is None:
+            return []
         
-        # Calculate similarity scores
-        similarity_scores = cosine_similarity(user_vector, self.job_vectors).flatten()
+        profile_hash = self._profile_hash(user)
+        result_key = (profile_hash, index['version'], index['generation'], top_n)
+        recommendations = self.recommendation_cache.get(result_key)
+        if recommendations is None:
+            parsed_skills = self._parsed_skills(user)
+            vector_key = (profile_hash, index['version'])
+            user_vector = self.profile_vector_cache.get(vector_key)
+            if user_vector is None:
+                with timed('recommend.transform'):
+                    user_vector = self._query_vectors(index, [self._user_profile(user, parsed_skills)])
+                self.profile_vector_cache.put(vector_key, user_vector)
+            
+            # Calculate similarity scores
+            with timed('recommend.similarity'):
+                rows, similarity_scores = self._scores(index, user_vector)[0]
+            with timed('recommend.rank'):
+                recommendations = self._rank(index, similarity_scores, user, parsed_skills, top_n, rows)
+            self.recommendation_cache.put(result_key, recommendations)
         
-        # Get top recommendations
-        top_indices = similarity_scores.argsort()[-top_n:][::-1]
+        # Copy the cached entries before attaching this request's Job objects
+        with timed('recommend.attach_jobs'):
+            return self._attach_jobs([[dict(rec) for rec in recommendations]])[0]
+    
+    def cache_stats(self):
+        return {
+            'profile_vectors': self.profile_vector_cache.stats(),
+            'recommendations': self.recommendation_cache.stats()
+        }
+    
+    def get_recommendations_batch(self, users, top_n=5):
+        """Yield (user, recommendations) for many users using one sparse product per chunk"""
+        self.ensure_index()
+        index = self._index_snapshot()
+        users = list(users)
+        if index is None:
+            for user in users:
+                yield user, []
+            return
         
-        recommendations = []
-        for idx in top_indices:
-            if similarity_scores[idx] > 0.05:  # Lower threshold for better matches
-                job = self.jobs_data[idx]
-                
-                # Calculate enhanced match score
-                base_score = similarity_scores[idx]
-                
-                # Experience matching bonus
-                experience_bonus = 0
-                if user.parsed_experience and job.experience_required:
-                    if user.parsed_experience == job.experience_required:
-                        experience_bonus = 0.1
-                    elif self._experience_compatible(user.parsed_experience, job.experience_required):
-                        experience_bonus = 0.05
-                
-                # Education matching bonus
-                education_bonus = 0
-                if user.parsed_education and user.parsed_education in job.description.lower():
-                    education_bonus = 0.05
-                
-                # Skills matching bonus
-                skills_bonus = 0
-                if user.parsed_skills:
-                    try:
-                        import json
-                        parsed_skills = json.loads(user.parsed_skills)
-                        job_skills = job.required_skills.lower()
-                        matching_skills = sum(1 for skill in parsed_skills if skill.lower() in job_skills)
-                        if matching_skills > 0:
-                            skills_bonus = min(0.2, matching_skills * 0.05)
-                    except:
-                        pass
-                
-                # Calculate final score
-                final_score = min(1.0, base_score + experience_bonus + education_bonus + skills_bonus)
-                
-                recommendations.append({
-                    'job': job,
-                    'similarity_score': float(final_score),
-                    'match_percentage': round(final_score * 100, 1),
-                    'base_score': round(base_score * 100, 1),
-                    'bonuses': {
-                        'experience': round(experience_bonus * 100, 1),
-                        'education': round(education_bonus * 100, 1),
-                        'skills': round(skills_bonus * 100, 1)
-                    }
-                })
-        
-        return recommendations
-    
-    def _experience_compatible(self, user_exp, job_exp):
-        """Check if user experience is compatible with job requirements"""
-        exp_levels = {
-            "0-1 years": 1,
-            "1-3 years": 2,
-            "3-5 years": 3,
-            "5-10 years": 4,
-            "10+ years": 5
+        # Bound the dense users x jobs score block held in memory at once
+        n_jobs = sum(segment['vectors'].shape[0] for segment in (index['base'], index['delta']) if segment is not None)
+        chunk_size = max(1, RECOMMENDATION_BATCH_MEMORY // (n_jobs * 8))
+        for start in range(0, len(users), chunk_size):
+            chunk = users[start:start + chunk_size]
+            with timed('recommend_batch.transform'):
+                parsed_skills = [self._parsed_skills(user) for user in chunk]
+                profiles = [self._user_profile(user, skills) for user, skills in zip(chunk, parsed_skills)]
+                query_vectors = self._query_vectors(index, profiles)
+            with timed('recommend_batch.similarity'):
+                scores = self._scores(index, query_vectors)
+            with timed('recommend_batch.rank'):
+                ranked = [self._rank(index, scores[row][1], user, parsed_skills[row], top_n, scores[row][0])
+                          for row, user in enumerate(chunk)]
+            with timed('recommend_batch.attach_jobs'):
+                ranked = self._attach_jobs(ranked)
+            yield from zip(chunk, ranked)
+    
+    def _attach_jobs(self, recommendation_lists):
+        """Load the recommended jobs by primary key in one query"""
+        job_ids = {rec['job_id'] for recommendations in recommendation_lists for rec in recommendations}
+        jobs = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids))} if job_ids else {}
+        for recommendations in recommendation_lists:
+            for rec in recommendations:
+                rec['job'] = jobs.get(rec['job_id'])
+        # Drop jobs deleted since the index was read
+        return [[rec for rec in recommendations if rec['job'] is not None]
+                for recommendations in recommendation_lists]
+    
+    def _top_matches(self, similarity_scores, tombstones, top_n, bonus_function):
+        """Pick the top_n rows by final score from an over-fetched candidate set.
+        
+        Returns the rows with their base scores, final scores and bonuses, best first.
+        """
+        similarity_scores[tombstones] = -1  # Never match edited or deleted rows
+        n_rows = len(similarity_scores)
+        k = min(n_rows, max(top_n, top_n * RECOMMENDATION_OVERFETCH))
+        while True:
+            if k < n_rows:
+                candidates = np.argpartition(similarity_scores, -k)[-k:]
+            else:
+                candidates = np.arange(n_rows)
+            base_scores = similarity_scores[candidates]
+            above_threshold = base_scores > MIN_SIMILARITY
+            candidates = candidates[above_threshold]
+            base_scores = base_scores[above_threshold]
+            bonuses = bonus_function(candidates)
+            final_scores = np.minimum(1.0, base_scores + sum(bonuses))
+            
+            # A row outside the candidate set scores at most its base plus the
+            # largest possible bonus, so stop once the top_n cannot change
+            if k >= n_rows or len(candidates) < k or len(candidates) < top_n:
+                break
+            cutoff = np.partition(final_scores, -top_n)[-top_n]
+            if cutoff >= base_scores.min() + MAX_MATCH_BONUS:
+                break
+            k = min(n_rows, k * 4)
+        
+        order = np.lexsort((-base_scores, -final_scores))[:top_n]
+        return candidates[order], base_scores[order], final_scores[order], [bonus[order] for bonus in bonuses]
+    
+    def _match_result(self, base_score, final_score, bonuses):
+        """Score fields shared by recommendations and candidates"""
+        experience_bonus, education_bonus, skills_bonus = bonuses
+        return {
+            'similarity_score': float(final_score),
+            'match_percentage': round(float(final_score) * 100, 1),
+            'base_score': round(float(base_score) * 100, 1),
+            'bonuses': {
+                'experience': round(float(experience_bonus) * 100, 1),
+                'education': round(float(education_bonus) * 100, 1),
+                'skills': round(float(skills_bonus) * 100, 1)
+            }
+        }
+    
+    def _rank(self, index, similarity_scores, user, parsed_skills, top_n, rows=None):
+        """Pick the top_n jobs for a user by final score.
+        
+        rows gives the index row of each score when only some rows were scored.
+        """
+        if rows is None:
+            tombstones = index['tombstones']
+        else:
+            tombstones = np.flatnonzero(np.isin(rows, index['tombstones']))
+        positions, base_scores, final_scores, bonuses = self._top_matches(
+            similarity_scores, tombstones, top_n,
+            lambda candidates: self._match_bonuses(index, candidates if rows is None else rows[candidates],
+                                                   user, parsed_skills)
+        )
+        job_ids = self._take(index, 'job_ids', positions if rows is None else rows[positions])
+        return [dict(job_id=int(job_id), **self._match_result(base_scores[i], final_scores[i],
+                                                               [bonus[i] for bonus in bonuses]))
+                for i, job_id in enumerate(job_ids)]
+    
+    def get_candidates(self, job, top_n=CANDIDATES_DEFAULT):
+        """Rank the users best matching a job, with the same bonuses as get_recommendations"""
+        self.ensure_index()
+        index = self._index_snapshot()
+        if index is None:
+            return []
+        users = self.candidates.snapshot(index)
+        if users is None:
+            return []
+        
+        with timed('candidates.transform'):
+            job_vector = users['vectorizer'].transform([self._job_text(job)])
+        with timed('candidates.similarity'):
+            similarity_scores = self._similarity(users, job_vector)[0]
+        with timed('candidates.rank'):
+            rows, base_scores, final_scores, bonuses = self._top_matches(
+                similarity_scores, users['tombstones'], top_n,
+                lambda candidates: self.candidates.match_bonuses(users, candidates, job)
+            )
+        user_ids = self._take(users, 'user_ids', rows).tolist()
+        loaded = {user.id: user for user in User.query.options(db.load_only(
+            User.id, User.full_name, User.email, User.location, User.experience, User.skills
+        )).filter(User.id.in_(user_ids))} if user_ids else {}
+        return [dict(user_id=user_id, user=loaded[user_id],
+                     **self._match_result(base_scores[i], final_scores[i], [bonus[i] for bonus in bonuses]))
+                for i, user_id in enumerate(user_ids) if user_id in loaded]
+    
+    def update_user(self, user_id):
+        """Re-vectorize a registered or re-parsed user for candidate ranking"""
+        self.candidates.log_change(user_id)
+    
+    def _job_column(self, index, candidates, column):
+        """Lowercased text column for candidate rows, for terms outside the precomputed tables"""
+        job_ids = self._take(index, 'job_ids', candidates).tolist()
+        values = dict(db.session.query(Job.id, column).filter(Job.id.in_(job_ids)))
+        return [(values.get(job_id) or "").lower() for job_id in job_ids]
+    
+    def _combine_bonuses(self, user_experience, job_experience, education_mentioned, matching_skills):
+        """Turn match facts into experience, education and skills bonuses.
+        
+        Experience is given as experience_code values. Either side may be a
+        scalar, so this serves both matching directions.
+        """
+        shape = np.shape(matching_skills)
+        user_experience = np.asarray(user_experience)
+        job_experience = np.asarray(job_experience)
+        # Experience matching bonus: the user needs 80% of the required level
+        required = np.broadcast_to((job_experience != 0) & (user_experience != 0), shape)
+        experience_bonus = np.zeros(shape)
+        experience_bonus[required & (np.maximum(user_experience, 0) >= np.maximum(job_experience, 0) * 0.8)] = 0.05
+        experience_bonus[required & (job_experience == user_experience) & (job_experience > 0)] = 0.1
+        
+        # Education matching bonus
+        education_bonus = np.where(education_mentioned, 0.05, 0.0)
+        
+        # Skills matching bonus
+        skills_bonus = np.minimum(0.2, np.asarray(matching_skills) * 0.05)
+        return experience_bonus, education_bonus, skills_bonus
+    
+    def _match_bonuses(self, index, candidates, user, parsed_skills):
+        """Compute experience, education and skills bonuses for candidate job rows"""
+        # Education matching
+        mentioned = np.zeros(len(candidates), dtype=bool)
+        if user.parsed_education:
+            if user.parsed_education in EDUCATION_LEVELS:
+                column = EDUCATION_LEVELS.index(user.parsed_education)
+                mentioned = self._take(index, 'job_education', candidates)[:, column]
+            else:
+                education = user.parsed_education.lower()
+                descriptions = self._job_column(index, candidates, Job.description)
+                mentioned = np.array([education in text for text in descriptions], dtype=bool)
+        
+        # Skills matching
+        matching_skills = np.zeros(len(candidates))
+        known_columns = []
+        required_skills = None
+        for skill in parsed_skills:
+            skill = skill.lower()
+            if skill in SKILL_COLUMNS:
+                known_columns.append(SKILL_COLUMNS[skill])
+                continue
+            if required_skills is None:
+                required_skills = self._job_column(index, candidates, Job.required_skills)
+            matching_skills += [skill in text for text in required_skills]
+        if known_columns:
+            matching_skills += self._skill_matches(index, candidates, known_columns)
+        
+        return self._combine_bonuses(experience_code(user.parsed_experience),
+                                     self._take(index, 'job_experience', candidates),
+                                     mentioned, matching_skills)
+
+# Per-row arrays stored next to the profile vectors in every candidate segment
+CANDIDATE_ARRAYS = ('user_ids', 'user_experience', 'user_education', 'user_fallback')
+
+class CandidateIndex:
+    """User profile vectors for ranking candidates against a job.
+    
+    Profiles are vectorized with the job index vocabulary, so the index is built
+    per job index version under <index_folder>/users/v<job version>.<build>/.
+    Registrations and re-parsed resumes are journaled to users/journal.log and
+    replayed by every worker, like job posts.
+    """
+    def __init__(self, engine, index_folder=INDEX_FOLDER):
+        self.engine = engine
+        self.folder = os.path.join(index_folder, 'users')
+        self.job_version = None  # Job index version the profiles were vectorized for
+        self.vectorizer = None
+        self.base = None  # Built segment, memory-mapped from the persisted index
+        self._build_path = None
+        self.delta = None  # Segment of profiles updated since the build
+        self._pending = []  # Single-user segments not yet stacked into delta
+        self.user_rows = {}  # User id -> row of its live vector
+        self.tombstones = set()  # Rows of users updated since
+        self._built_rows = 0
+        self._changed_rows = 0
+        self._journal_offset = 0
+        self._last_refresh = 0.0
+        self._lock = threading.RLock()
+    
+    def _user_features(self, user):
+        parsed_skills = self.engine._parsed_skills(user)
+        education = user.parsed_education or ""
+        skills = [skill.lower() for skill in parsed_skills]
+        known = [SKILL_COLUMNS[skill] for skill in skills if skill in SKILL_COLUMNS]
+        return (
+            self.engine._user_profile(user, parsed_skills),
+            experience_code(user.parsed_experience),
+            EDUCATION_LEVELS.index(education) if education in EDUCATION_LEVELS else -1,
+            # Education or skills outside the tables are matched against the job's text
+            (bool(education) and education not in EDUCATION_LEVELS) or len(known) < len(skills),
+            known
+        )
+    
+    def _segment(self, vectorizer, users):
+        """Vectorize users and bundle them with the per-row arrays used for scoring"""
+        profiles, experience, education, fallback, skills = zip(*map(self._user_features, users))
+        skills_indptr = np.cumsum([0] + [len(columns) for columns in skills])
+        skills_indices = np.fromiter((column for columns in skills for column in columns),
+                                     dtype=np.int32, count=skills_indptr[-1])
+        return {
+            'vectors': vectorizer.transform(profiles),
+            'user_ids': np.array([user.id for user in users], dtype=np.int32),
+            'user_experience': np.array(experience, dtype=np.int8),
+            'user_education': np.array(education, dtype=np.int8),
+            'user_fallback': np.array(fallback, dtype=bool),
+            'user_skills': self.engine._skills_matrix(skills_indices, skills_indptr)
         }
+    
+    def _profiles(self):
+        """Query the user columns a profile is built from, as rows"""
+        return db.session.query(User.id, User.skills, User.parsed_skills, User.resume_excerpt, User.experience,
+                                User.education, User.parsed_experience, User.parsed_education)
+    
+    def rebuild(self, index):
+        """Vectorize every user for a job index snapshot, persist the result and load it"""
+        if index is None:
+            return
+        journal_offset = self._journal_size()
+        segments = []
+        last_id = 0
+        while True:
+            users = self._profiles().filter(User.id > last_id).order_by(User.id).limit(CANDIDATE_BUILD_CHUNK).all()
+            if not users:
+                break
+            segments.append(self._segment(index['vectorizer'], users))
+            last_id = users[-1].id
+        if not segments:
+            return
+        
+        path = self._save(index['version'], self.engine._stack(*segments), journal_offset)
+        loaded = self._load(path)
+        if loaded is None:
+            raise RuntimeError(f"Candidate index {path} could not be loaded")
+        with self._lock:
+            self._install(index['vectorizer'], index['version'], path, *loaded)
+            self._sync_journal()
+    
+    def _builds(self, job_version):
+        """Persisted builds for a job index version, newest last"""
+        prefix = f"v{job_version}."
+        try:
+            names = [name for name in os.listdir(self.folder) if name.startswith(prefix)]
+        except OSError:
+            return []
+        return [os.path.join(self.folder, name) for name in sorted(names, key=lambda name: int(name[len(prefix):]))]
+    
+    def _save(self, job_version, segment, journal_offset):
+        """Write a new build for job_version and drop builds no worker needs any more"""
+        os.makedirs(self.folder, exist_ok=True)
+        tmp_path = os.path.join(self.folder, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp_path)
+        vectors = segment['vectors']
+        skills = segment['user_skills']
+        arrays = {name: segment[name] for name in CANDIDATE_ARRAYS}
+        arrays.update(data=vectors.data, indices=vectors.indices, indptr=vectors.indptr,
+                      user_skills_indices=skills.indices, user_skills_indptr=skills.indptr)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump({'format': INDEX_FORMAT, 'job_version': job_version, 'shape': list(vectors.shape),
+                       'journal_offset': journal_offset, 'skills': SKILLS_KEYWORDS,
+                       'education': EDUCATION_LEVELS, 'created_at': datetime.utcnow().isoformat()}, f)
+        path = os.path.join(self.folder, f"v{job_version}.{time.time_ns()}")
+        os.rename(tmp_path, path)
+        
+        # Keep the newest two builds of the live and previous job versions
+        keep = set()
+        for version in {job_version, self.job_version, self.engine._read_current_version()}:
+            keep.update(self._builds(version)[-2:])
+        for name in os.listdir(self.folder):
+            if name.startswith('v') and os.path.join(self.folder, name) not in keep:
+                shutil.rmtree(os.path.join(self.folder, name), ignore_errors=True)
+        return path
+    
+    def _load(self, path):
+        """Memory-map a persisted build; returns None if it is missing or incompatible"""
+        from scipy import sparse
+        
+        try:
+            with open(os.path.join(path, 'meta.json')) as f:
+                meta = json.load(f)
+            if (meta['format'] != INDEX_FORMAT or meta['skills'] != SKILLS_KEYWORDS
+                    or meta['education'] != EDUCATION_LEVELS):
+                return None
+            
+            def load(name):
+                return np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+            
+            vectors = sparse.csr_matrix((load('data'), load('indices'), load('indptr')),
+                                        shape=tuple(meta['shape']), copy=False)
+            segment = dict({name: load(name) for name in CANDIDATE_ARRAYS}, vectors=vectors,
+                           user_skills=self.engine._skills_matrix(load('user_skills_indices'),
+                                                                  load('user_skills_indptr')))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading candidate index {path}: {e}")
+            return None
+        return segment, meta['journal_offset']
+    
+    def _install(self, vectorizer, job_version, path, segment, journal_offset):
+        """Make a loaded build live; called under the lock"""
+        self.vectorizer = vectorizer
+        self.job_version = job_version
+        self.base = segment
+        self._build_path = path
+        self.delta = None
+        self._pending = []
+        self.user_rows = {int(user_id): row for row, user_id in enumerate(segment['user_ids'])}
+        self.tombstones = set()
+        self._built_rows = len(self.user_rows)
+        self._changed_rows = 0
+        self._journal_offset = journal_offset
+    
+    def _refresh(self, index):
+        """Load the newest build for the job index version and apply journaled changes; called under the lock"""
+        self._last_refresh = time.monotonic()
+        builds = self._builds(index['version'])
+        if builds and (self.job_version != index['version'] or self._build_path != builds[-1]):
+            loaded = self._load(builds[-1])
+            if loaded is not None:
+                self._install(index['vectorizer'], index['version'], builds[-1], *loaded)
+        if self.base is not None:
+            self._sync_journal()
+    
+    def is_stale(self, index):
+        """True when some worker ranks candidates but nothing is built for the job index version yet"""
+        if index is None or self._builds(index['version']):
+            return False
+        try:
+            return any(name.startswith('v') for name in os.listdir(self.folder))
+        except OSError:
+            return False
+    
+    # Change journal: "update <user id>" lines, replayed by every worker
+    def _journal_path(self):
+        return os.path.join(self.folder, 'journal.log')
+    
+    def _journal_size(self):
+        try:
+            return os.path.getsize(self._journal_path())
+        except OSError:
+            return 0
+    
+    def log_change(self, user_id):
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self._journal_path(), 'a') as f:
+            f.write(f"update {user_id}\n")
+    
+    def _sync_journal(self):
+        """Apply journal lines past our offset; called under the lock"""
+        if self._journal_size() <= self._journal_offset:
+            return
+        with open(self._journal_path(), 'rb') as f:
+            f.seek(self._journal_offset)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1  # Ignore a partially written last line
+        self._journal_offset += end
+        user_ids = {int(line.split()[1]) for line in chunk[:end].decode().splitlines()}
+        for user_id in user_ids:
+            row = self.user_rows.pop(user_id, None)
+            if row is not None:
+                self.tombstones.add(row)
+                self._changed_rows += 1
+        users = self._profiles().filter(User.id.in_(user_ids)).all()
+        first_row = self._row_count() + sum(len(segment['user_ids']) for segment in self._pending)
+        for row, user in enumerate(users, first_row):
+            self.user_rows[user.id] = row
+            self._changed_rows += 1
+        if users:
+            self._pending.append(self._segment(self.vectorizer, users))
+    
+    def _row_count(self):
+        rows = self.base['vectors'].shape[0] if self.base is not None else 0
+        if self.delta is not None:
+            rows += self.delta['vectors'].shape[0]
+        return rows
+    
+    def needs_compaction(self):
+        with self._lock:
+            return self._changed_rows > 0 and self._changed_rows >= max(1, self._built_rows) * INDEX_GROWTH_THRESHOLD
+    
+    def snapshot(self, index):
+        """Consistent references to the candidate segments and the vectorizer their profiles used.
         
-        user_level = exp_levels.get(user_exp, 0)
-        job_level = exp_levels.get(job_exp, 0)
+        After a refit the previous build keeps serving until the background thread
+        has built profiles for the new job index version.
+        """
+        users = self._current(index)
+        if users is None:
+            # First use: build once, in whichever process takes the compaction lock first
+            with self.engine._compaction_lock(blocking=True):
+                with self._lock:
+                    self._refresh(index)
+                if self.base is None:
+                    self.rebuild(index)
+            users = self._current(index)
+        return users
+    
+    def _current(self, index):
+        with self._lock:
+            if self.base is None or time.monotonic() - self._last_refresh >= INDEX_RELOAD_INTERVAL:
+                self._refresh(index)
+            if self.base is None:
+                return None
+            if self._pending:
+                pending = self.engine._stack(*self._pending)
+                self.delta = pending if self.delta is None else self.engine._stack(self.delta, pending)
+                self._pending = []
+            return {
+                'vectorizer': self.vectorizer,
+                'base': self.base,
+                'delta': self.delta,
+                'tombstones': list(self.tombstones)
+            }
+    
+    def match_bonuses(self, users, candidates, job):
+        """Experience, education and skills bonuses of candidate user rows for one job"""
+        experience, job_skills, job_education = self.engine._job_features(job)
+        take = self.engine._take
+        
+        education = take(users, 'user_education', candidates)
+        mentioned = (education >= 0) & np.asarray(job_education, dtype=bool)[np.maximum(education, 0)]
+        matching_skills = (self.engine._skill_matches(users, candidates, job_skills, name='user_skills')
+                           if job_skills else np.zeros(len(candidates)))
+        
+        # Terms outside the precomputed tables are looked up in the job's text
+        fallback = np.flatnonzero(take(users, 'user_fallback', candidates))
+        if len(fallback):
+            user_ids = take(users, 'user_ids', candidates[fallback]).tolist()
+            parsed = dict(db.session.query(User.id, User.parsed_education).filter(User.id.in_(user_ids)))
+            skills = dict(db.session.query(User.id, User.parsed_skills).filter(User.id.in_(user_ids)))
+            description = (job.description or "").lower()
+            required_skills = (job.required_skills or "").lower()
+            for i, user_id in zip(fallback, user_ids):
+                user_education = parsed.get(user_id) or ""
+                if user_education and user_education not in EDUCATION_LEVELS:
+                    mentioned[i] = user_education.lower() in description
+                matching_skills[i] = 0
+                for skill in json.loads(skills.get(user_id) or '[]'):
+                    skill = skill.lower()
+                    if skill in SKILL_COLUMNS:
+                        matching_skills[i] += SKILL_COLUMNS[skill] in job_skills
+                    else:
+                        matching_skills[i] += skill in required_skills
         
-        # User should have at least 80% of required experience
-        return user_level >= (job_level * 0.8)
+        return self.engine._combine_bonuses(take(users, 'user_experience', candidates), experience,
+                                            mentioned, matching_skills)
 
 # Initialize recommendation engine
 recommendation_engine = JobRecommendationEngine()
 
+# Background resume parsing
+# Cached parses from another parser or skill dictionary are ignored
+RESUME_PARSER_VERSION = "1-" + hashlib.sha1("\n".join(SKILLS_KEYWORDS).encode()).hexdigest()[:12]
+
+def cached_resume_parse(filename):
+    """Parsed data previously stored for a resume with the same bytes, or None"""
+    content_hash = resume_content_hash(filename)
+    if content_hash is None:
+        return None
+    cached = db.session.get(ParsedResume, content_hash)
+    if cached is None or cached.parser_version != RESUME_PARSER_VERSION:
+        return None
+    return json.loads(cached.parsed_data)
+
+def store_resume_parse(filename, parsed_data):
+    content_hash = resume_content_hash(filename)
+    if content_hash is not None and parsed_data:
+        db.session.merge(ParsedResume(content_hash=content_hash, parser_version=RESUME_PARSER_VERSION,
+                                      parsed_data=json.dumps(parsed_data)))
+
+def parsed_resume_fields(parsed_data):
+    """User column values for a parse_resume_content result"""
+    return {
+        'parsed_skills': json.dumps(parsed_data.get('extracted_skills', [])),
+        'parsed_experience': parsed_data.get('experience_level', ''),
+        'parsed_education': parsed_data.get('education', ''),
+        'resume_text': parsed_data.get('resume_text', ''),
+        'parse_status': 'done' if parsed_data else 'failed'
+    }
+
+def apply_parsed_resume(user, parsed_data):
+    """Copy a parse_resume_content result onto the user"""
+    for name, value in parsed_resume_fields(parsed_data).items():
+        setattr(user, name, value)
+
+class ResumeParseQueue:
+    """Resume parsing queue persisted in the database and drained by a process pool"""
+    def __init__(self, workers=RESUME_PARSE_WORKERS, max_pending=RESUME_QUEUE_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool = None
+        self._in_flight = 0
+        self._running = {}  # File path -> future, so duplicate uploads share one parse
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+    
+    def is_full(self):
+        """True when more resumes are queued than the pool can work off soon"""
+        queued = ResumeParseTask.query.filter(ResumeParseTask.status.in_(['pending', 'running'])).count()
+        return queued >= self.max_pending
+    
+    def enqueue(self, user, file_path, file_extension):
+        """Add a parse task for user, or reuse the cached parse of the same file.
+        
+        Returns the task, or None on a cache hit; the caller commits either way.
+        """
+        cached = cached_resume_parse(file_path)
+        if cached is not None:
+            apply_parsed_resume(user, cached)
+            return None
+        user.parse_status = 'pending'
+        task = ResumeParseTask(user_id=user.id, file_path=file_path, file_extension=file_extension)
+        db.session.add(task)
+        return task
+    
+    def notify(self):
+        """Make sure the dispatcher runs and have it scan the queue now"""
+        self.start()
+        self._wakeup.set()
+    
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._dispatch_loop, name='resume-parse-queue', daemon=True)
+            self._thread.start()
+    
+    def _dispatch_loop(self):
+        while True:
+            try:
+                with app.app_context():
+                    self._requeue_abandoned()
+                    self._dispatch()
+            except Exception as e:
+                print(f"Error dispatching resume parse tasks: {e}")
+            self._wakeup.wait(RESUME_QUEUE_POLL_INTERVAL)
+            self._wakeup.clear()
+    
+    def _requeue_abandoned(self):
+        """Retry tasks left running by a crashed or restarted process, or stuck in a hung parse"""
+        cutoff = datetime.utcfromtimestamp(time.time() - RESUME_PARSE_TIMEOUT)
+        abandoned = ((ResumeParseTask.status == 'running') & (ResumeParseTask.updated_at < cutoff))
+        file_paths = {file_path for (file_path,) in db.session.query(ResumeParseTask.file_path).filter(abandoned)}
+        if not file_paths:
+            return
+        db.session.execute(
+            db.update(ResumeParseTask).where(abandoned).values(status='pending', updated_at=datetime.utcnow())
+        )
+        db.session.commit()
+        
+        with self._lock:
+            hung = [self._running.pop(file_path) for file_path in file_paths if file_path in self._running]
+            if hung:
+                # A running parse cannot be cancelled; leave it to the old pool and retry in a new one
+                self._in_flight -= len(hung)
+                self._pool.shutdown(wait=False)
+                self._pool = None
+    
+    def _dispatch(self):
+        with self._lock:
+            capacity = self.workers - self._in_flight
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        if capacity <= 0:
+            return
+        
+        tasks = (ResumeParseTask.query.filter_by(status='pending')
+                 .order_by(ResumeParseTask.id).limit(capacity).all())
+        for task in tasks:
+            # Claim the task so other processes draining the same queue skip it
+            exhausted = task.attempts >= RESUME_PARSE_MAX_ATTEMPTS
+            claimed = db.session.execute(
+                db.update(ResumeParseTask)
+                .where(ResumeParseTask.id == task.id, ResumeParseTask.status == 'pending')
+                .values(status='failed' if exhausted else 'running',
+                        attempts=ResumeParseTask.attempts + (0 if exhausted else 1), updated_at=datetime.utcnow())
+            ).rowcount
+            db.session.commit()
+            if not claimed:
+                continue
+            
+            # Requeued after its last attempt hung or crashed the pool
+            if exhausted:
+                user = db.session.get(User, task.user_id)
+                if user is not None:
+                    apply_parsed_resume(user, {})
+                store_resume_parse(task.file_path, {})
+                task.error = f"Gave up after {task.attempts} attempts"
+                db.session.commit()
+                recommendation_engine.update_user(task.user_id)
+                continue
+            
+            # Another upload of the same file may have been parsed meanwhile
+            cached = cached_resume_parse(task.file_path)
+            if cached is not None:
+                user = db.session.get(User, task.user_id)
+                if user is not None:
+                    apply_parsed_resume(user, cached)
+                task.status = 'done'
+                db.session.commit()
+                recommendation_engine.update_user(task.user_id)
+                continue
+            
+            with self._lock:
+                future = self._running.get(task.file_path)
+                if future is None:
+                    try:
+                        future = self._pool.submit(parse_resume_task, task.file_path, task.file_extension)
+                    except BrokenProcessPool:
+                        # A parser process died (e.g. out of memory on a hostile file); start a new pool
+                        self._pool.shutdown(wait=False)
+                        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                        future = self._pool.submit(parse_resume_task, task.file_path, task.file_extension)
+                    self._in_flight += 1
+                    self._running[task.file_path] = future
+                    future.add_done_callback(lambda future, file_path=task.file_path: self._release(file_path, future))
+            future.add_done_callback(lambda future, task_id=task.id: self._finish(task_id, future))
+    
+    def _release(self, file_path, future):
+        with self._lock:
+            # Futures dropped by _requeue_abandoned were already released
+            if self._running.get(file_path) is not future:
+                return
+            del self._running[file_path]
+            self._in_flight -= 1
+        self._wakeup.set()
+    
+    def _finish(self, task_id, future):
+        try:
+            with app.app_context():
+                task = db.session.get(ResumeParseTask, task_id)
+                user = db.session.get(User, task.user_id)
+                error = future.exception()
+                parsed_data = {}
+                if error is None:
+                    parsed_data, observations = future.result()
+                    for stage, seconds in observations:
+                        metrics.observe_stage(stage, seconds)
+                if error is not None and task.attempts < RESUME_PARSE_MAX_ATTEMPTS:
+                    task.status = 'pending'
+                else:
+                    task.status = 'done' if parsed_data else 'failed'
+                    if user is not None:
+                        apply_parsed_resume(user, parsed_data)
+                    store_resume_parse(task.file_path, parsed_data)
+                task.error = str(error) if error is not None else None
+                task.updated_at = datetime.utcnow()
+                db.session.commit()
+                if task.status != 'pending':
+                    recommendation_engine.update_user(task.user_id)
+        except Exception as e:
+            print(f"Error saving parsed resume for task {task_id}: {e}")
+
+def parse_resume_task(file_path, file_extension):
+    """Pool worker: parse a resume and return its stage timings for the parent's metrics"""
+    with metrics.capture() as observations:
+        parsed_data = parse_resume_content(file_path, file_extension)
+    return parsed_data, observations
+
+resume_parse_queue = ResumeParseQueue()
+
+@app.before_request
+def start_resume_parse_queue():
+    """Start the dispatcher with the first request, so pending parses resume under any WSGI server"""
+    resume_parse_queue.start()
+
+# Request timing and optional profiling
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    if PROFILING_ENABLED and request.headers.get(PROFILE_HEADER):
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def record_request_time(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+        # The profile replaces the body; the original status is kept in a header
+        response = Response(output.getvalue(), mimetype='text/plain',
+                            headers={'X-Profiled-Status': str(response.status_code)})
+    if 'request_start' in g:
+        metrics.requests.observe((request.endpoint or 'unmatched', request.method, str(response.status_code)),
+                                 time.perf_counter() - g.request_start)
+    return response
+
+@before_render_template.connect_via(app)
+def start_render_timer(sender, template, context, **extra):
+    g.render_start = time.perf_counter()
+
+@template_rendered.connect_via(app)
+def record_render_time(sender, template, context, **extra):
+    if 'render_start' in g:
+        metrics.observe_stage(f'render.{template.name}', time.perf_counter() - g.pop('render_start'))
+
 # Routes
 @app.route('/')
 def index():
@@ -352,29 +2094,29 @@ def register():
         data = request.form
         
         # Check if user already exists
-        if User.query.filter_by(username=data['username']).first():
+        if db.session.query(User.id).filter_by(username=data['username']).first():
             flash('Username already exists!')
             return render_template('register.html')
         
-        if User.query.filter_by(email=data['email']).first():
+        if db.session.query(User.id).filter_by(email=data['email']).first():
             flash('Email already registered!')
             return render_template('register.html')
         
-        # Handle resume upload and parsing
+        # Handle resume upload; parsing runs in the background queue
         resume_filename = None
-        parsed_data = {}
+        file_extension = None
         if 'resume' in request.files:
             resume_file = request.files['resume']
             if resume_file.filename != '':
+                if resume_parse_queue.is_full():
+                    flash('We are processing a large number of resumes. Please try again in a few minutes.')
+                    return render_template('register.html'), 503, {'Retry-After': str(RESUME_QUEUE_POLL_INTERVAL * 12)}
+                
                 resume_filename = save_resume(resume_file)
                 if not resume_filename:
                     flash('Invalid file format. Please upload PDF, DOC, or DOCX files only.')
                     return render_template('register.html')
-                
-                # Parse resume content
                 file_extension = resume_file.filename.rsplit('.', 1)[1].lower()
-                file_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
-                parsed_data = parse_resume_content(file_path, file_extension)
         
         # Create new user
         user = User(
@@ -389,14 +2131,23 @@ def register():
             phone=data['phone'],
             resume_summary=data.get('resume_summary', ''),
             resume_filename=resume_filename,
-            parsed_skills=json.dumps(parsed_data.get('extracted_skills', [])),
-            parsed_experience=parsed_data.get('experience_level', ''),
-            parsed_education=parsed_data.get('education', ''),
-            resume_text=parsed_data.get('resume_text', '')
+            parsed_skills=json.dumps([]),
+            parsed_experience='',
+            parsed_education='',
+            resume_text=''
         )
         
         db.session.add(user)
+        task = None
+        if resume_filename:
+            db.session.flush()
+            file_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
+            task = resume_parse_queue.enqueue(user, file_path, file_extension)
+        increment_stat('users')
         db.session.commit()
+        recommendation_engine.update_user(user.id)
+        if task is not None:
+            resume_parse_queue.notify()
         
         flash('Registration successful! Please login.')
         return redirect(url_for('login'))
@@ -407,7 +2158,8 @@ def register():
 def login():
     if request.method == 'POST':
         data = request.form
-        user = User.query.filter_by(username=data['username']).first()
+        user = (User.query.options(db.load_only(User.id, User.username, User.password_hash))
+                .filter_by(username=data['username']).first())
         
         if user and check_password_hash(user.password_hash, data['password']):
             session['user_id'] = user.id
@@ -432,66 +2184,94 @@ def employer_login():
     
     return render_template('employer_login.html')
 
+def recommendation_user(user_id):
+    """Load a user with the resume excerpt matching needs, but not the full resume text"""
+    return User.query.options(db.undefer(User.resume_excerpt)).filter(User.id == user_id).first()
+
+def recommendation_users(user_ids):
+    return (User.query.options(db.undefer(User.resume_excerpt))
+            .filter(User.id.in_(user_ids)).order_by(User.id).all())
+
 @app.route('/dashboard')
 def dashboard():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
-    user = User.query.get(session['user_id'])
+    user = recommendation_user(session['user_id'])
     recommendations = recommendation_engine.get_recommendations(user)
     
     return render_template('dashboard.html', user=user, recommendations=recommendations)
 
+def time_ago(moment):
+    """Describe how long ago a timestamp was, in the largest whole unit"""
+    seconds = max(0, int((datetime.utcnow() - moment).total_seconds()))
+    for unit, size in (('day', 86400), ('hour', 3600), ('minute', 60)):
+        if seconds >= size:
+            count = seconds // size
+            return f'{count} {unit}{"s" if count > 1 else ""} ago'
+    return 'just now'
+
 @app.route('/employer_dashboard')
 def employer_dashboard():
     if 'employer_name' not in session:
         return redirect(url_for('employer_login'))
     
-    jobs = Job.query.filter_by(posted_by=session['employer_name']).all()
-    
-    # Calculate statistics
-    active_jobs = len(jobs)
-    total_applications = 0  # Placeholder - would need application tracking
-    in_review = 0  # Placeholder - would need application status tracking
-    hired = 0  # Placeholder - would need hiring tracking
+    employer_name = session['employer_name']
+    # Only the columns and description prefix the job cards show, a page at a time
+    query = (db.session.query(Job.id, Job.title, Job.company, Job.location, Job.job_type, Job.description_preview,
+                              Job.created_at)
+             .filter(Job.posted_by == employer_name))
+    cursor = request.args.get('cursor')
+    try:
+        jobs, next_cursor = keyset_page(query, cursor, EMPLOYER_DASHBOARD_JOBS)
+    except ValueError:
+        abort(400)
+    next_url = url_for('employer_dashboard', cursor=next_cursor) if next_cursor else None
+    first_url = url_for('employer_dashboard') if cursor else None
     
-    # Calculate real statistics based on actual data
-    all_jobs = Job.query.all()
-    all_users = User.query.all()
+    # Per-job application counts for the listed jobs, from the (job_id, status) index
+    application_counts = {}
+    if jobs:
+        application_counts = dict(db.session.query(Application.job_id, db.func.count(Application.id))
+                                  .filter(Application.job_id.in_([job.id for job in jobs]))
+                                  .group_by(Application.job_id))
     
-    # Real statistics calculation
+    # Calculate statistics from the materialized counters
+    counters = get_stats(f'jobs:{employer_name}', f'applications:{employer_name}',
+                         f'applications:{employer_name}:In Review', f'applications:{employer_name}:Hired')
     stats = {
-        'active_jobs': active_jobs,
-        'total_applications': len(all_users) * 2,  # Estimate based on user count
-        'in_review': len(all_users),  # Estimate based on user count
-        'hired': max(1, len(all_users) // 10),  # Estimate 10% hire rate
-        'active_jobs_change': f'+{max(0, active_jobs - 1)} this week' if active_jobs > 0 else '0 this week',
-        'applications_change': f'+{len(all_users) * 5}%' if all_users else '0%',
-        'in_review_change': f'{len(all_users)}%' if all_users else '0%',
-        'hired_change': f'+{max(0, len(all_users) // 10)} this month' if all_users else '0 this month'
+        'active_jobs': counters[f'jobs:{employer_name}'],
+        'total_applications': counters[f'applications:{employer_name}'],
+        'in_review': counters[f'applications:{employer_name}:In Review'],
+        'hired': counters[f'applications:{employer_name}:Hired']
     }
     
-    # Real recent applications data based on actual users
+    # Newest applications to this employer's jobs
     recent_applications = []
-    for i, user in enumerate(all_users[:4]):  # Show up to 4 recent users
-        if jobs:  # If there are jobs posted
-            job = jobs[i % len(jobs)]  # Cycle through available jobs
-            statuses = ['New', 'In Review', 'Accepted']
-            status = statuses[i % len(statuses)]
-            time_ago = f'{i + 1} day{"s" if i > 0 else ""} ago'
-            
-            recent_applications.append({
-                'name': user.full_name,
-                'role': job.title,
-                'time': time_ago,
-                'status': status
-            })
+    recent = (db.session.query(Application.id, Application.status, Application.created_at, User.full_name, Job.title)
+              .join(User, User.id == Application.user_id)
+              .join(Job, Job.id == Application.job_id)
+              .filter(Application.employer == employer_name)
+              .order_by(Application.created_at.desc(), Application.id.desc())
+              .limit(EMPLOYER_RECENT_APPLICATIONS))
+    for application in recent:
+        recent_applications.append({
+            'id': application.id,
+            'name': application.full_name,
+            'role': application.title,
+            'time': time_ago(application.created_at),
+            'status': application.status
+        })
     
     return render_template('employer_dashboard.html', 
                          jobs=jobs, 
-                         employer_name=session['employer_name'],
+                         employer_name=employer_name,
                          stats=stats,
-                         recent_applications=recent_applications)
+                         application_counts=application_counts,
+                         application_statuses=APPLICATION_STATUSES,
+                         recent_applications=recent_applications,
+                         next_url=next_url,
+                         first_url=first_url)
 
 @app.route('/post_job', methods=['GET', 'POST'])
 def post_job():
@@ -514,20 +2294,158 @@ def post_job():
         )
         
         db.session.add(job)
+        increment_stat('jobs')
+        increment_stat(f'jobs:{job.posted_by}')
         db.session.commit()
         
-        # Update recommendation engine with new job
-        recommendation_engine.update_job_vectors()
+        # Index the new job incrementally; compaction refits in the background
+        recommendation_engine.add_job(job)
         
         flash('Job posted successfully!')
         return redirect(url_for('employer_dashboard'))
     
     return render_template('post_job.html')
 
+# Job applications
+@app.route('/jobs/<int:job_id>/apply', methods=['POST'])
+def apply_job(job_id):
+    if 'user_id' not in session:
+        return redirect(url_for('login'))
+    
+    employer = db.session.query(Job.posted_by).filter(Job.id == job_id).scalar()
+    if employer is None:
+        abort(404)
+    
+    try:
+        db.session.add(Application(user_id=session['user_id'], job_id=job_id, employer=employer))
+        increment_stat(f'applications:{employer}')
+        increment_stat(f'applications:{employer}:New')
+        db.session.commit()
+        flash('Application submitted!')
+    except IntegrityError:
+        db.session.rollback()
+        flash('You have already applied for this job.')
+    
+    return redirect(request.referrer or url_for('dashboard'))
+
+@app.route('/applications/<int:application_id>/status', methods=['POST'])
+def update_application_status(application_id):
+    if 'employer_name' not in session:
+        return redirect(url_for('employer_login'))
+    
+    status = request.form.get('status')
+    if status not in APPLICATION_STATUSES:
+        abort(400)
+    
+    application = db.session.get(Application, application_id)
+    if application is None or application.employer != session['employer_name']:
+        abort(404)
+    
+    if application.status != status:
+        increment_stat(f'applications:{application.employer}:{application.status}', -1)
+        increment_stat(f'applications:{application.employer}:{status}')
+        application.status = status
+        application.updated_at = datetime.utcnow()
+        db.session.commit()
+        flash(f'Application marked as {status}.')
+    
+    return redirect(url_for('employer_dashboard'))
+
+# Job listing with keyset pagination
+def encode_job_cursor(job):
+    return base64.urlsafe_b64encode(f"{job.created_at.isoformat()}|{job.id}".encode()).decode()
+
+def decode_job_cursor(cursor):
+    """Return (created_at, id) from a cursor; raises ValueError if it is malformed"""
+    created_at, job_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+    return datetime.fromisoformat(created_at), int(job_id)
+
+def keyset_page(query, cursor=None, limit=JOBS_PAGE_SIZE):
+    """Load one newest-first page of a job query and the cursor of the next page"""
+    if cursor:
+        created_at, job_id = decode_job_cursor(cursor)
+        query = query.filter(db.tuple_(Job.created_at, Job.id) < (created_at, job_id))
+    
+    # Fetch one extra row to learn whether there is a next page
+    jobs = query.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_job_cursor(jobs[limit - 1]) if len(jobs) > limit else None
+    return jobs[:limit], next_cursor
+
+def job_filters(args):
+    """Filters from the query string; each one is served by a composite index"""
+    return {
+        'location': args.get('location', '').strip(),
+        'job_type': args.get('job_type', '').strip(),
+        'experience': args.get('experience', '').strip()
+    }
+
+def job_page(filters, cursor=None, limit=JOBS_PAGE_SIZE):
+    """Load one newest-first page of jobs and the cursor of the next page"""
+    query = Job.query
+    if filters['location']:
+        query = query.filter(Job.location == filters['location'])
+    if filters['job_type']:
+        query = query.filter(Job.job_type == filters['job_type'])
+    if filters['experience']:
+        query = query.filter(Job.experience_required == filters['experience'])
+    return keyset_page(query, cursor, limit)
+
+def search_match_expression(query):
+    """Quote each search term so user input cannot inject FTS5 query syntax"""
+    terms = re.findall(r'\w+', query.lower())
+    if not terms:
+        return None
+    # All terms must match; the last one may be a prefix of a longer word
+    return ' '.join(f'"{term}"' for term in terms) + '*'
+
+def search_jobs(query, filters, page=1, limit=JOBS_PAGE_SIZE):
+    """Rank jobs matching query by BM25 and return one page plus whether more follow"""
+    match = search_match_expression(query)
+    if match is None:
+        return [], False
+    
+    conditions = ["job_fts MATCH :match"]
+    params = {'match': match, 'limit': limit + 1, 'offset': (page - 1) * limit}
+    for column, key in (('location', 'location'), ('job_type', 'job_type'),
+                        ('experience_required', 'experience')):
+        if filters[key]:
+            conditions.append(f"job.{column} = :{key}")
+            params[key] = filters[key]
+    join = " JOIN job ON job.id = job_fts.rowid" if len(conditions) > 1 else ""
+    job_ids = [job_id for (job_id,) in db.session.execute(db.text(
+        f"SELECT job_fts.rowid FROM job_fts{join} WHERE {' AND '.join(conditions)} "
+        f"ORDER BY rank LIMIT :limit OFFSET :offset"
+    ), params)]
+    
+    has_next = len(job_ids) > limit
+    job_ids = job_ids[:limit]
+    jobs = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids))} if job_ids else {}
+    return [jobs[job_id] for job_id in job_ids if job_id in jobs], has_next
+
 @app.route('/jobs')
 def jobs():
-    jobs = Job.query.order_by(Job.created_at.desc()).all()
-    return render_template('jobs.html', jobs=jobs)
+    filters = job_filters(request.args)
+    query = request.args.get('q', '').strip()
+    active = {key: value for key, value in filters.items() if value}
+    next_url = None
+    if query:
+        page = max(1, request.args.get('page', 1, type=int))
+        jobs, has_next = search_jobs(query, filters, page)
+        if has_next:
+            next_url = url_for('jobs', q=query, page=page + 1, **active)
+    else:
+        try:
+            jobs, next_cursor = job_page(filters, request.args.get('cursor'))
+        except ValueError:
+            abort(400)
+        if next_cursor:
+            next_url = url_for('jobs', cursor=next_cursor, **active)
+    
+    first_url = None
+    if request.args.get('cursor') or request.args.get('page', 1, type=int) > 1:
+        first_url = url_for('jobs', **(dict(active, q=query) if query else active))
+    return render_template('jobs.html', jobs=jobs, filters=filters, query=query, next_url=next_url,
+                           first_url=first_url, job_types=JOB_TYPES, experience_levels=EXPERIENCE_LEVELS)
 
 @app.route('/logout')
 def logout():
@@ -540,13 +2458,7 @@ def uploaded_file(filename):
     return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
 
 # API endpoints
-@app.route('/api/recommendations/<int:user_id>')
-def api_recommendations(user_id):
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
-    recommendations = recommendation_engine.get_recommendations(user)
+def recommendations_to_json(recommendations):
     result = []
     for rec in recommendations:
         job = rec['job']
@@ -554,19 +2466,475 @@ def api_recommendations(user_id):
             'id': job.id,
             'title': job.title,
             'company': job.company,
-            'description': job.description[:200] + '...',
+            'description': job.description_preview + '...',
             'location': job.location,
             'match_percentage': rec['match_percentage'],
             'base_score': rec.get('base_score', 0),
             'bonuses': rec.get('bonuses', {})
         })
+    return result
+
+def recommendation_lines(users, top_n):
+    """Yield one JSON line per user with their recommendations"""
+    for user, recommendations in recommendation_engine.get_recommendations_batch(users, top_n):
+        yield json.dumps({
+            'user_id': user.id,
+            'recommendations': recommendations_to_json(recommendations)
+        }) + "\n"
+
+@app.route('/api/recommendations/<int:user_id>')
+def api_recommendations(user_id):
+    user = recommendation_user(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    recommendations = recommendation_engine.get_recommendations(user)
+    return jsonify(recommendations_to_json(recommendations))
+
+@app.route('/api/jobs')
+def api_jobs():
+    limit = request.args.get('limit', JOBS_PAGE_SIZE, type=int)
+    if not 1 <= limit <= JOBS_MAX_PAGE_SIZE:
+        return jsonify({'error': f'limit must be between 1 and {JOBS_MAX_PAGE_SIZE}'}), 400
+    try:
+        jobs, next_cursor = job_page(job_filters(request.args), request.args.get('cursor'), limit)
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
     
+    return jsonify({
+        'jobs': [{
+            'id': job.id,
+            'title': job.title,
+            'company': job.company,
+            'description': job.description_preview + '...',
+            'location': job.location,
+            'job_type': job.job_type,
+            'experience_required': job.experience_required,
+            'salary': job.salary,
+            'created_at': job.created_at.isoformat()
+        } for job in jobs],
+        'next_cursor': next_cursor
+    })
+
+@app.route('/api/jobs/search')
+def api_search_jobs():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+    page = request.args.get('page', 1, type=int)
+    limit = request.args.get('limit', JOBS_PAGE_SIZE, type=int)
+    if page < 1 or not 1 <= limit <= JOBS_MAX_PAGE_SIZE:
+        return jsonify({'error': f'page must be positive and limit between 1 and {JOBS_MAX_PAGE_SIZE}'}), 400
+    
+    jobs, has_next = search_jobs(query, job_filters(request.args), page, limit)
+    return jsonify({
+        'jobs': [{
+            'id': job.id,
+            'title': job.title,
+            'company': job.company,
+            'description': job.description_preview + '...',
+            'location': job.location,
+            'job_type': job.job_type,
+            'experience_required': job.experience_required
+        } for job in jobs],
+        'page': page,
+        'has_next': has_next
+    })
+
+@app.route('/api/jobs/<int:job_id>/candidates')
+def api_job_candidates(job_id):
+    if 'employer_name' not in session:
+        return jsonify({'error': 'Employer login required'}), 401
+    job = db.session.get(Job, job_id)
+    if job is None or job.posted_by != session['employer_name']:
+        return jsonify({'error': 'Job not found'}), 404
+    top_n = request.args.get('top_n', CANDIDATES_DEFAULT, type=int)
+    if not 1 <= top_n <= JOBS_MAX_PAGE_SIZE:
+        return jsonify({'error': f'top_n must be between 1 and {JOBS_MAX_PAGE_SIZE}'}), 400
+    
+    return jsonify([{
+        'id': candidate['user'].id,
+        'full_name': candidate['user'].full_name,
+        'email': candidate['user'].email,
+        'location': candidate['user'].location,
+        'experience': candidate['user'].experience,
+        'skills': candidate['user'].skills,
+        'match_percentage': candidate['match_percentage'],
+        'base_score': candidate['base_score'],
+        'bonuses': candidate['bonuses']
+    } for candidate in recommendation_engine.get_candidates(job, top_n)])
+
+@app.route('/api/resume_status/<int:user_id>')
+def api_resume_status(user_id):
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required'}), 401
+    if session['user_id'] != user_id:
+        return jsonify({'error': 'User not found'}), 404
+    user = (User.query.options(db.load_only(User.id, User.parse_status, User.parsed_skills,
+                                            User.parsed_experience, User.parsed_education))
+            .filter(User.id == user_id).first())
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    result = {'status': user.parse_status}
+    if user.parse_status == 'pending':
+        resume_parse_queue.notify()
+    elif user.parse_status == 'done':
+        result.update({
+            'skills': json.loads(user.parsed_skills or '[]'),
+            'experience': user.parsed_experience,
+            'education': user.parsed_education
+        })
     return jsonify(result)
 
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/recommendations/cache')
+def api_recommendation_cache():
+    return jsonify(recommendation_engine.cache_stats())
+
+@app.route('/api/recommendations/batch', methods=['POST'])
+def api_recommendations_batch():
+    data = request.get_json(silent=True) or {}
+    user_ids = data.get('user_ids')
+    if not isinstance(user_ids, list) or not all(isinstance(user_id, int) for user_id in user_ids):
+        return jsonify({'error': 'user_ids must be a list of integers'}), 400
+    if len(user_ids) > RECOMMENDATION_BATCH_MAX_USERS:
+        return jsonify({'error': f'At most {RECOMMENDATION_BATCH_MAX_USERS} user ids per request'}), 400
+    top_n = data.get('top_n', 5)
+    if not isinstance(top_n, int) or top_n < 1:
+        return jsonify({'error': 'top_n must be a positive integer'}), 400
+    
+    users = recommendation_users(user_ids)
+    return Response(stream_with_context(recommendation_lines(users, top_n)),
+                    mimetype='application/x-ndjson')
+
+# CLI commands
+def _recommend_user_chunk(args):
+    """Worker process: render the recommendation lines for a chunk of user ids"""
+    user_ids, top_n = args
+    with app.app_context():
+        users = recommendation_users(user_ids)
+        return "".join(recommendation_lines(users, top_n))
+
+@app.cli.command('recommend-all')
+@click.option('--top-n', default=5, show_default=True, help='Recommendations per user.')
+@click.option('--output', type=click.File('w'), default='-', help='JSON lines output file (default stdout).')
+@click.option('--workers', default=os.cpu_count(), show_default=True, help='Worker processes.')
+@click.option('--chunk-size', default=500, show_default=True, help='Users per worker task.')
+def recommend_all(top_n, output, workers, chunk_size):
+    """Write job recommendations for every user as JSON lines."""
+    recommendation_engine.ensure_index()
+    user_ids = [user_id for (user_id,) in db.session.query(User.id).order_by(User.id)]
+    chunks = [(user_ids[i:i + chunk_size], top_n) for i in range(0, len(user_ids), chunk_size)]
+    
+    if workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+        # Windows: workers cannot inherit the loaded index, so run in this process
+        click.echo("Worker processes need the 'fork' start method; using one process", err=True)
+        workers = 1
+    if workers <= 1:
+        for chunk in chunks:
+            output.write(_recommend_user_chunk(chunk))
+        return
+    
+    # Forked workers share the memory-mapped index; each opens its own database connections
+    db.engine.dispose()
+    context = multiprocessing.get_context('fork')
+    with context.Pool(workers) as pool:
+        for lines in pool.imap(_recommend_user_chunk, chunks):
+            output.write(lines)
+
+@app.cli.command('refresh-stats')
+def refresh_stats_command():
+    """Recompute the dashboard counters from the user and job tables."""
+    refresh_stats()
+    click.echo(f"Refreshed {PortalStat.query.count()} counters")
+
+@app.cli.command('upgrade-db')
+def upgrade_db_command():
+    """Create missing tables and columns and the job search index."""
+    db.create_all()
+    upgrade_database()
+    ensure_job_search_index()
+    click.echo("Database schema is up to date")
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index():
+    """Create the job search index if needed and rebuild it from the job table."""
+    ensure_job_search_index()
+    db.session.execute(db.text("INSERT INTO job_fts(job_fts) VALUES ('rebuild')"))
+    db.session.commit()
+    click.echo("Job search index rebuilt")
+
+@app.cli.command('gc-resumes')
+@click.option('--dry-run', is_flag=True, help='Only report what would be removed.')
+@click.option('--grace', default=RESUME_GC_GRACE, show_default=True,
+              help='Seconds to keep recently uploaded files that no user references yet.')
+def gc_resumes(dry_run, grace):
+    """Delete stored resumes and cached parses that no user references."""
+    referenced = {filename for (filename,) in
+                  db.session.query(User.resume_filename).filter(User.resume_filename.isnot(None))}
+    cutoff = time.time() - grace
+    removed_files = removed_bytes = 0
+    for entry in os.scandir(app.config['UPLOAD_FOLDER']):
+        if not entry.is_file() or entry.name in referenced or entry.stat().st_mtime > cutoff:
+            continue
+        removed_files += 1
+        removed_bytes += entry.stat().st_size
+        if not dry_run:
+            os.remove(entry.path)
+    
+    live_hashes = {resume_content_hash(filename) for filename in referenced}
+    stale_hashes = [content_hash for (content_hash,) in db.session.query(ParsedResume.content_hash)
+                    if content_hash not in live_hashes]
+    if not dry_run:
+        for start in range(0, len(stale_hashes), 500):
+            ParsedResume.query.filter(ParsedResume.content_hash.in_(stale_hashes[start:start + 500])).delete()
+        db.session.commit()
+    
+    action = 'Would remove' if dry_run else 'Removed'
+    click.echo(f"{action} {removed_files} resume files ({removed_bytes / 1024 / 1024:.1f} MB) "
+               f"and {len(stale_hashes)} cached parses")
+
+# Bulk import and export
+def read_records(source, file_format):
+    """Yield (line number, record) from a CSV or JSON lines file; record is None for unreadable lines"""
+    if file_format == 'csv':
+        reader = csv.DictReader(source)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for number, line in enumerate(source, 1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError:
+            yield number, None
+
+def import_row(record, fields, required):
+    """Column values of an import record; raises ValueError saying what is wrong with it"""
+    if not isinstance(record, dict):
+        raise ValueError("not a valid record")
+    row = {field: str(record[field]).strip() if record.get(field) is not None else '' for field in fields}
+    missing = [field for field in required if not row[field]]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    return row
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def use_bulk_load_pragmas():
+    """Switch SQLite to WAL so the site keeps reading while a bulk load writes"""
+    if db.engine.dialect.name == 'sqlite':
+        db.session.execute(db.text('PRAGMA journal_mode=WAL'))  # Persists in the database file
+        db.session.execute(db.text('PRAGMA synchronous=NORMAL'))  # Safe with WAL; no fsync per commit
+        db.session.commit()
+
+def import_jobs(records, chunk_size):
+    """Insert job records one transaction per chunk; returns (imported, skipped)"""
+    imported = skipped = 0
+    for chunk in chunked(records, chunk_size):
+        rows = []
+        for number, record in chunk:
+            try:
+                row = import_row(record, JOB_IMPORT_FIELDS, JOB_REQUIRED_FIELDS)
+            except ValueError as e:
+                click.echo(f"Skipping line {number}: {e}", err=True)
+                skipped += 1
+                continue
+            row['posted_by'] = row['posted_by'] or row['company']
+            rows.append(row)
+        if rows:
+            db.session.connection().execute(db.insert(Job), rows)
+            counts = Counter(f"jobs:{row['posted_by']}" for row in rows)
+            counts['jobs'] = len(rows)
+            increment_stats(counts)
+            db.session.commit()
+        imported += len(rows)
+    return imported, skipped
+
+def import_users(records, chunk_size, resume_dir, workers):
+    """Insert user records one transaction per chunk, parsing resumes in a process pool.
+    
+    Resumes and password hashes of the next chunk are computed while the
+    current chunk is written. Returns (imported, skipped).
+    """
+    imported = skipped = 0
+    claimed = set()  # Usernames and emails taken by earlier rows of this import
+    parses = {}  # Stored resume path -> future, so a resume shared by rows is parsed once
+    previous = None
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in chunked(records, chunk_size):
+            valid = []
+            for number, record in chunk:
+                try:
+                    valid.append((number, record, import_row(record, USER_IMPORT_FIELDS, USER_REQUIRED_FIELDS)))
+                except ValueError as e:
+                    click.echo(f"Skipping line {number}: {e}", err=True)
+                    skipped += 1
+            names = [row['username'] for _, _, row in valid]
+            emails = [row['email'] for _, _, row in valid]
+            claimed.update(name for (name,) in db.session.query(User.username).filter(User.username.in_(names)))
+            claimed.update(email for (email,) in db.session.query(User.email).filter(User.email.in_(emails)))
+            
+            prepared = []
+            for number, record, row in valid:
+                if row['username'] in claimed or row['email'] in claimed:
+                    click.echo(f"Skipping line {number}: username or email already exists", err=True)
+                    skipped += 1
+                    continue
+                
+                resume_filename = parsed = None
+                resume = str(record.get('resume') or '').strip()
+                if resume:
+                    path = os.path.join(resume_dir, resume)
+                    if not allowed_file(path) or not os.path.isfile(path):
+                        click.echo(f"Skipping line {number}: resume {resume} is not a PDF, DOC or DOCX file",
+                                   err=True)
+                        skipped += 1
+                        continue
+                    extension = path.rsplit('.', 1)[1].lower()
+                    with open(path, 'rb') as f:
+                        resume_filename = store_resume(f, extension)
+                    file_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
+                    parsed = cached_resume_parse(file_path)
+                    if parsed is None:
+                        if file_path not in parses:
+                            parses[file_path] = pool.submit(parse_resume_content, file_path, extension)
+                        parsed = parses[file_path]
+                
+                if record.get('password_hash'):
+                    password_hash = str(record['password_hash'])
+                elif record.get('password'):
+                    password_hash = pool.submit(generate_password_hash, str(record['password']))
+                else:
+                    password_hash = UNUSABLE_PASSWORD_HASH
+                claimed.update((row['username'], row['email']))
+                prepared.append((row, resume_filename, parsed, password_hash))
+            
+            if previous:
+                imported += insert_user_chunk(previous, parses)
+            previous = prepared
+        if previous:
+            imported += insert_user_chunk(previous, parses)
+    return imported, skipped
+
+def insert_user_chunk(prepared, parses):
+    """Write one chunk of prepared user rows once their parses and hashes are done"""
+    def resolve(value):
+        return value.result() if isinstance(value, Future) else value
+    
+    rows = []
+    for row, resume_filename, parsed, password_hash in prepared:
+        row = dict(row, password_hash=resolve(password_hash), resume_filename=resume_filename,
+                   parsed_skills=json.dumps([]), parsed_experience='', parsed_education='', resume_text='',
+                   parse_status=None)
+        if resume_filename:
+            file_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
+            if isinstance(parsed, Future):
+                parsed = parsed.result()
+                store_resume_parse(file_path, parsed)
+                parses.pop(file_path, None)
+            row.update(parsed_resume_fields(parsed))
+        rows.append(row)
+    # A registration that raced the import keeps its username or email
+    inserted = db.session.connection().execute(sqlite_insert(User).on_conflict_do_nothing(), rows).rowcount
+    increment_stat('users', inserted)
+    db.session.commit()
+    return inserted
+
+def export_columns(kind, include_password_hashes=False):
+    """Output field name -> column for export-data, in the import-data layout"""
+    if kind == 'jobs':
+        return {'id': Job.id, **{field: getattr(Job, field) for field in JOB_IMPORT_FIELDS},
+                'created_at': Job.created_at}
+    columns = {'id': User.id, **{field: getattr(User, field) for field in USER_IMPORT_FIELDS},
+               'resume': User.resume_filename, 'created_at': User.created_at}
+    if include_password_hashes:
+        columns['password_hash'] = User.password_hash
+    return columns
+
+@app.cli.command('import-data')
+@click.argument('kind', type=click.Choice(['jobs', 'users']))
+@click.argument('source', type=click.File('r', encoding='utf-8'))
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'jsonl']),
+              help='Input format (default from the file extension, else jsonl).')
+@click.option('--chunk-size', default=IMPORT_CHUNK_SIZE, show_default=True, help='Rows per transaction.')
+@click.option('--resume-dir', type=click.Path(exists=True, file_okay=False),
+              help="Folder resume paths of user rows are relative to (default: the input file's folder).")
+@click.option('--workers', default=RESUME_PARSE_WORKERS, show_default=True,
+              help='Processes parsing resumes and hashing passwords.')
+def import_data(kind, source, file_format, chunk_size, resume_dir, workers):
+    """Bulk import jobs or users from CSV or JSON lines, then rebuild the index once."""
+    file_format = file_format or ('csv' if source.name.lower().endswith('.csv') else 'jsonl')
+    use_bulk_load_pragmas()
+    records = read_records(source, file_format)
+    start = time.perf_counter()
+    if kind == 'jobs':
+        imported, skipped = import_jobs(records, chunk_size)
+    else:
+        resume_dir = resume_dir or os.path.dirname(os.path.abspath(source.name))
+        imported, skipped = import_users(records, chunk_size, resume_dir, workers)
+    elapsed = time.perf_counter() - start
+    click.echo(f"Imported {imported} {kind} in {elapsed:.1f}s ({imported / max(elapsed, 1e-9):.0f}/s), "
+               f"skipped {skipped}")
+    if not imported:
+        return
+    
+    # One refit for the whole import instead of one per row
+    start = time.perf_counter()
+    if kind == 'jobs':
+        recommendation_engine.update_job_vectors()
+    else:
+        recommendation_engine.ensure_index()
+        recommendation_engine.candidates.rebuild(recommendation_engine._index_snapshot())
+    click.echo(f"Rebuilt the {'job' if kind == 'jobs' else 'candidate'} index in "
+               f"{time.perf_counter() - start:.1f}s")
+
+@app.cli.command('export-data')
+@click.argument('kind', type=click.Choice(['jobs', 'users']))
+@click.option('--output', type=click.File('w', encoding='utf-8'), default='-', help='Output file (default stdout).')
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'jsonl']),
+              help='Output format (default from the file extension, else jsonl).')
+@click.option('--chunk-size', default=IMPORT_CHUNK_SIZE, show_default=True, help='Rows fetched per query batch.')
+@click.option('--include-password-hashes', is_flag=True, help='Export user password hashes so logins survive a re-import.')
+def export_data(kind, output, file_format, chunk_size, include_password_hashes):
+    """Stream jobs or users as CSV or JSON lines in the import-data layout."""
+    file_format = file_format or ('csv' if output.name.lower().endswith('.csv') else 'jsonl')
+    columns = export_columns(kind, include_password_hashes)
+    model = Job if kind == 'jobs' else User
+    writer = None
+    if file_format == 'csv':
+        writer = csv.DictWriter(output, fieldnames=list(columns))
+        writer.writeheader()
+    
+    start = time.perf_counter()
+    exported = 0
+    for row in db.session.query(*columns.values()).order_by(model.id).yield_per(chunk_size):
+        record = {name: value.isoformat() if isinstance(value, datetime) else value
+                  for name, value in zip(columns, row)}
+        if writer is not None:
+            writer.writerow(record)
+        else:
+            output.write(json.dumps(record) + "\n")
+        exported += 1
+    elapsed = time.perf_counter() - start
+    click.echo(f"Exported {exported} {kind} in {elapsed:.1f}s ({exported / max(elapsed, 1e-9):.0f}/s)", err=True)
+
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
-        # Update job vectors after creating tables
-        recommendation_engine.update_job_vectors()
+        upgrade_database()
+        ensure_job_search_index()
+        # Load the persisted job index, fitting it on first start
+        recommendation_engine.ensure_index()
+    recommendation_engine.start_compaction_worker()
+    resume_parse_queue.start()  # Resume any parsing left pending by the last run
     
     app.run(debug=True)
@@ -0,0 +1,114 @@
+"""Compare recall and latency of the ann recommendation mode with the exact TF-IDF path.
+
+Recall@k is the share of the exact mode's top k jobs that the ann mode also
+returns. Users carry no parsed resume data, so no bonuses apply and both modes
+rank purely by similarity. Each probe count is measured separately;
+"all" scans every IVF list, isolating the error of the embedding itself.
+
+Usage: python benchmarks/bench_ann.py [--jobs 50000] [--users 300] [--top-n 10]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+WORKDIR = tempfile.mkdtemp(prefix='bench-ann-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(WORKDIR, 'bench.db')}"
+
+import app as portal  # noqa: E402
+from app import SKILLS_KEYWORDS, Job, JobRecommendationEngine, LRUCache, User, app, db  # noqa: E402
+
+WORDS = ("build maintain scalable services team customers platform data pipelines product design "
+         "review mentor deliver features cloud infrastructure reliable secure").split()
+
+
+def seed_jobs(count, rng, families):
+    rows = []
+    for i in range(count):
+        family = rng.choice(families)
+        skills = rng.sample(family, 4) + rng.sample(SKILLS_KEYWORDS, 1)
+        rows.append({
+            'title': f"{rng.choice(['Senior', 'Junior', 'Lead', ''])} {skills[0].title()} Engineer".strip(),
+            'company': f"Company {i % 500}",
+            'description': ' '.join(rng.choices(WORDS + skills * 3, k=80)),
+            'required_skills': ', '.join(skills),
+            'experience_required': rng.choice(['0-1 years', '1-3 years', '3-5 years', '5-10 years']),
+            'location': 'Remote', 'job_type': 'Full-time', 'posted_by': f"Company {i % 500}",
+            'contact_email': 'jobs@example.com'
+        })
+        if len(rows) == 5000:
+            db.session.execute(db.insert(Job), rows)
+            rows = []
+    if rows:
+        db.session.execute(db.insert(Job), rows)
+    db.session.commit()
+
+
+def make_users(count, rng, families):
+    users = []
+    for i in range(count):
+        skills = rng.sample(rng.choice(families), 4)
+        users.append(User(id=i + 1, skills=', '.join(skills), experience='3-5 years', education="Bachelor's",
+                          resume_text=' '.join(rng.choices(WORDS + skills * 2, k=60))))
+    return users
+
+
+def run(engine, users, top_n):
+    """Recommended job ids per user and per-request latencies in ms, with caching disabled"""
+    engine.profile_vector_cache = LRUCache(0)
+    engine.recommendation_cache = LRUCache(0)
+    results, latencies = [], []
+    for user in users:
+        start = time.perf_counter()
+        recommendations = engine.get_recommendations(user, top_n)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({rec['job_id'] for rec in recommendations})
+    return results, latencies
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=50000)
+    parser.add_argument('--users', type=int, default=300)
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--probes', default='1,4,8,16,all')
+    args = parser.parse_args()
+    rng = random.Random(7)
+    families = [rng.sample(SKILLS_KEYWORDS, 12) for _ in range(40)]
+
+    with app.app_context():
+        db.create_all()
+        seed_jobs(args.jobs, rng, families)
+        users = make_users(args.users, rng, families)
+
+        exact = JobRecommendationEngine(os.path.join(WORKDIR, 'exact'), mode='exact')
+        ann = JobRecommendationEngine(os.path.join(WORKDIR, 'ann'), mode='ann')
+        for name, engine in (('exact', exact), ('ann', ann)):
+            start = time.perf_counter()
+            engine.update_job_vectors()
+            print(f"{name} index fitted on {args.jobs} jobs in {time.perf_counter() - start:.1f}s")
+        lists = len(ann.ann['centroids'])
+
+        expected, latencies = run(exact, users, args.top_n)
+        print(f"\n{'mode':<16} {'recall@' + str(args.top_n):>10} {'p50 ms':>8} {'p99 ms':>8}")
+        print(f"{'exact':<16} {1.0:>10.3f} {percentile(latencies, 0.5):>8.2f} {percentile(latencies, 0.99):>8.2f}")
+        for probes in args.probes.split(','):
+            portal.ANN_PROBES = lists if probes == 'all' else int(probes)
+            found, latencies = run(ann, users, args.top_n)
+            recall = statistics.mean(len(got & want) / len(want) for got, want in zip(found, expected) if want)
+            label = f"ann probes={probes}"
+            print(f"{label:<16} {recall:>10.3f} {percentile(latencies, 0.5):>8.2f} {percentile(latencies, 0.99):>8.2f}")
+        print(f"({lists} IVF lists, {portal.ANN_DIMENSIONS} dimensions)")
+
+
+if __name__ == '__main__':
+    main()
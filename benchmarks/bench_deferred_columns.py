@@ -0,0 +1,130 @@
+"""Compare loading users and jobs with and without the deferred text columns.
+
+Each path is timed twice: as the routes now load it, and with the heavy
+columns undeferred the way every query loaded them before.
+
+Usage: python benchmarks/bench_deferred_columns.py [--users 100000] [--jobs 20000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATABASE = os.path.join(tempfile.mkdtemp(prefix='bench-deferred-'), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DATABASE}'
+
+from app import (SKILLS_KEYWORDS, Job, User, app, db, job_filters, job_page,  # noqa: E402
+                 recommendation_user, recommendation_users)
+
+WORDS = ("built maintained scalable services led team customers platform data pipelines product "
+         "designed reviewed mentored delivered features cloud infrastructure reliable secure").split()
+
+
+def seed(users, jobs, rng):
+    rows = []
+    for i in range(users):
+        skills = rng.sample(SKILLS_KEYWORDS, 5)
+        rows.append({
+            'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x',
+            'full_name': f'User {i}', 'skills': ', '.join(skills), 'experience': '3-5 years',
+            'education': "Bachelor's", 'location': 'Remote', 'phone': '555-0100',
+            'parsed_skills': '[]', 'parsed_experience': '', 'parsed_education': '',
+            # A few kilobytes of lowercased resume text, like parse_resume_content stores
+            'resume_text': ' '.join(rng.choices(WORDS + skills, k=rng.randint(400, 800)))
+        })
+        if len(rows) == 5000:
+            db.session.execute(db.insert(User), rows)
+            rows = []
+    if rows:
+        db.session.execute(db.insert(User), rows)
+    rows = []
+    for i in range(jobs):
+        skills = rng.sample(SKILLS_KEYWORDS, 4)
+        rows.append({
+            'title': f"{skills[0].title()} Engineer", 'company': f"Company {i % 500}",
+            'description': ' '.join(rng.choices(WORDS + skills, k=rng.randint(300, 600))),
+            'required_skills': ', '.join(skills), 'experience_required': '3-5 years',
+            'location': 'Remote', 'job_type': 'Full-time', 'posted_by': f"Company {i % 500}",
+            'contact_email': 'jobs@example.com'
+        })
+        if len(rows) == 5000:
+            db.session.execute(db.insert(Job), rows)
+            rows = []
+    if rows:
+        db.session.execute(db.insert(Job), rows)
+    db.session.commit()
+
+
+def measure(function, repeat):
+    """Median milliseconds per call and peak Python memory of one call in KiB"""
+    samples = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    db.session.expunge_all()
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    db.session.expunge_all()
+    return statistics.median(samples), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--jobs', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        seed(args.users, args.jobs, rng)
+        print(f"Seeded {args.users} users and {args.jobs} jobs in {time.perf_counter() - start:.1f}s ({DATABASE})")
+
+        usernames = [f'user{rng.randrange(args.users)}' for _ in range(50)]
+        user_ids = [rng.randrange(1, args.users + 1) for _ in range(50)]
+        chunk = list(range(1, min(args.users, 500) + 1))
+
+        def full_user():
+            return User.query.options(db.undefer(User.resume_text), db.undefer(User.resume_excerpt))
+
+        full_job = db.undefer(Job.description)
+        filters = job_filters({})
+
+        paths = [
+            ('login lookup x50',
+             lambda: [User.query.options(db.load_only(User.id, User.username, User.password_hash))
+                      .filter_by(username=name).first() for name in usernames],
+             lambda: [full_user().filter_by(username=name).first() for name in usernames]),
+            ('dashboard user x50',
+             lambda: [recommendation_user(user_id) for user_id in user_ids],
+             lambda: [full_user().filter(User.id == user_id).first() for user_id in user_ids]),
+            ('batch of 500 users',
+             lambda: recommendation_users(chunk),
+             lambda: full_user().filter(User.id.in_(chunk)).order_by(User.id).all()),
+            ('job page of 100',
+             lambda: job_page(filters, limit=100),
+             lambda: Job.query.options(full_job).order_by(Job.created_at.desc(), Job.id.desc()).limit(101).all()),
+            ('all jobs',
+             lambda: Job.query.all(),
+             lambda: Job.query.options(full_job).all()),
+        ]
+        print(f"{'path':<20} {'deferred ms':>11} {'full ms':>9} {'deferred KiB':>13} {'full KiB':>10}")
+        for name, slim, full in paths:
+            slim_ms, slim_kib = measure(slim, args.repeat)
+            full_ms, full_kib = measure(full, args.repeat)
+            print(f"{name:<20} {slim_ms:>11.2f} {full_ms:>9.2f} {slim_kib:>13.0f} {full_kib:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Compare FTS5 job search with a LIKE '%term%' scan on a seeded database.
+
+Usage: python benchmarks/bench_job_search.py [--jobs 100000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATABASE = os.path.join(tempfile.mkdtemp(prefix='bench-search-'), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DATABASE}'
+
+from app import SKILLS_KEYWORDS, Job, app, db, job_filters, search_jobs  # noqa: E402
+
+WORDS = ("build maintain scalable services team customers platform data pipelines product "
+         "design review mentor deliver features cloud infrastructure reliable secure").split()
+QUERIES = ['python', 'machine learning', 'kubernetes docker', 'senior react', 'graphql api']
+
+
+def seed(count, rng):
+    rows = []
+    for i in range(count):
+        skills = rng.sample(SKILLS_KEYWORDS, 4)
+        rows.append({
+            'title': f"{rng.choice(['Senior', 'Junior', 'Lead', ''])} {skills[0].title()} Engineer".strip(),
+            'company': f"Company {i % 500}",
+            'description': ' '.join(rng.choices(WORDS + skills, k=120)),
+            'required_skills': ', '.join(skills),
+            'experience_required': rng.choice(['0-1 years', '1-3 years', '3-5 years', '5-10 years']),
+            'location': rng.choice(['New York', 'London', 'Remote', 'Berlin']),
+            'job_type': rng.choice(['Full-time', 'Part-time', 'Contract', 'Remote']),
+            'posted_by': f"Company {i % 500}",
+            'contact_email': 'jobs@example.com'
+        })
+        if len(rows) == 5000:
+            db.session.execute(db.insert(Job), rows)
+            rows = []
+    if rows:
+        db.session.execute(db.insert(Job), rows)
+    db.session.commit()
+
+
+def like_query(query):
+    jobs = db.session.query(Job.id)
+    for term in query.split():
+        pattern = f"%{term}%"
+        jobs = jobs.filter(db.or_(Job.title.like(pattern), Job.description.like(pattern),
+                                  Job.required_skills.like(pattern)))
+    return jobs
+
+
+def like_first_page(query, limit=20):
+    """Newest matches only: stops early on common terms but cannot rank"""
+    return like_query(query).order_by(Job.created_at.desc()).limit(limit).all()
+
+
+def like_all_matches(query):
+    """Every match, which any relevance ranking on top of LIKE has to examine"""
+    return like_query(query).all()
+
+
+def timed(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        seed(args.jobs, random.Random(7))
+        print(f"Seeded {args.jobs} jobs in {time.perf_counter() - start:.1f}s ({DATABASE})")
+
+        filters = job_filters({})
+        print(f"{'query':<20} {'fts5 ranked':>12} {'like page':>10} {'like all':>9}  (median ms)")
+        for query in QUERIES:
+            fts = timed(lambda: search_jobs(query, filters), args.repeat)
+            like_page = timed(lambda: like_first_page(query), args.repeat)
+            like_all = timed(lambda: like_all_matches(query), args.repeat)
+            print(f"{query:<20} {fts:>12.2f} {like_page:>10.2f} {like_all:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
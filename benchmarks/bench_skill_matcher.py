@@ -0,0 +1,60 @@
+"""Compare the single-pass SkillMatcher with the old per-keyword substring loop.
+
+Usage: python benchmarks/bench_skill_matcher.py [--words 800] [--repeat 200]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import SKILLS_KEYWORDS, SkillMatcher  # noqa: E402
+
+FILLER = ("led team delivered project using built services for customers improved "
+          "performance designed reviewed code mentored engineers production systems").split()
+
+
+def synthetic_skills(count, rng):
+    """Extend the built-in keywords with made-up one and two word skills"""
+    skills = list(SKILLS_KEYWORDS)
+    while len(skills) < count:
+        word = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+        skills.append(word if rng.random() < 0.7 else f"{word} {rng.choice(FILLER)}")
+    return skills
+
+
+def synthetic_resume(skills, words, rng):
+    tokens = [rng.choice(FILLER) for _ in range(words)]
+    for position in rng.sample(range(words), min(words, 40)):
+        tokens[position] = rng.choice(skills)
+    return ' '.join(tokens)
+
+
+def substring_loop(skills, text):
+    return [skill for skill in skills if skill in text]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=800, help='Words per synthetic resume')
+    parser.add_argument('--repeat', type=int, default=200, help='Resumes timed per measurement')
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    print(f"{'skills':>8} {'loop ms':>10} {'matcher ms':>11} {'speedup':>8} {'compile ms':>11}")
+    for count in (len(SKILLS_KEYWORDS), 1000, 5000):
+        skills = synthetic_skills(count, rng)
+        text = synthetic_resume(skills, args.words, rng)
+        compile_seconds = timeit.timeit(lambda: SkillMatcher(skills), number=1)
+        matcher = SkillMatcher(skills)
+        loop_seconds = timeit.timeit(lambda: substring_loop(skills, text), number=args.repeat) / args.repeat
+        matcher_seconds = timeit.timeit(lambda: matcher.find(text), number=args.repeat) / args.repeat
+        print(f"{count:>8} {loop_seconds * 1000:>10.3f} {matcher_seconds * 1000:>11.3f} "
+              f"{loop_seconds / matcher_seconds:>7.1f}x {compile_seconds * 1000:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
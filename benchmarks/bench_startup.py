@@ -0,0 +1,90 @@
+"""Measure app import time and per-resume parse time.
+
+Import time is measured in fresh interpreters, which also report whether the
+heavy optional modules (SciPy, scikit-learn, NLTK, PyPDF2, python-docx) were loaded.
+Parse time is the median parse_resume_content call on generated PDF and DOCX
+resumes (see synthetic.py). preprocess_text is timed on generated job texts.
+
+Usage: python benchmarks/bench_startup.py [--imports 5] [--resumes 40] [--pages 2]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+WORKDIR = tempfile.mkdtemp(prefix='bench-startup-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(WORKDIR, 'bench.db')}"
+HEAVY_MODULES = ('scipy', 'sklearn', 'nltk', 'PyPDF2', 'docx')
+
+IMPORT_PROBE = f"""
+import json, sys, time
+sys.path.insert(0, {REPO_DIR!r})
+start = time.perf_counter()
+import app
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'loaded': [name for name in {HEAVY_MODULES!r} if name in sys.modules]}}))
+"""
+
+
+def import_times(runs):
+    """Seconds to import app in fresh interpreters, and the heavy modules it loaded"""
+    samples, loaded = [], []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', IMPORT_PROBE], cwd=WORKDIR, capture_output=True,
+                                text=True, check=True)
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        samples.append(report['seconds'])
+        loaded = report['loaded']
+    return samples, loaded
+
+
+def median_ms(function, calls):
+    samples = []
+    for args in calls:
+        start = time.perf_counter()
+        function(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--imports', type=int, default=5, help='Fresh interpreters to time the import in.')
+    parser.add_argument('--resumes', type=int, default=40, help='Resumes of each format to parse.')
+    parser.add_argument('--pages', type=int, default=2)
+    args = parser.parse_args()
+
+    samples, loaded = import_times(args.imports)
+    print(f"import app: median {statistics.median(samples) * 1000:.0f} ms, min {min(samples) * 1000:.0f} ms "
+          f"over {args.imports} runs; heavy modules loaded: {', '.join(loaded) or 'none'}")
+
+    sys.path[:0] = [REPO_DIR, BENCHMARKS_DIR]
+    from app import JobRecommendationEngine, parse_resume_content  # noqa: E402
+    from synthetic import WORDS, write_resumes  # noqa: E402
+
+    files = write_resumes(os.path.join(WORKDIR, 'resumes'), args.resumes, pages=args.pages)
+    for extension in ('pdf', 'docx'):
+        calls = [(path, ext) for path, ext in files if ext == extension]
+        parse_resume_content(*calls[0])  # Load the parser modules outside the measurement
+        print(f"parse_resume_content[{extension}]: median {median_ms(parse_resume_content, calls):.2f} ms "
+              f"over {len(calls)} resumes")
+
+    rng = random.Random(7)
+    texts = [(f"Engineer {i}: " + ' '.join(rng.choices(WORDS, k=150)) + f" ({rng.randint(1, 10)}+ years!)",)
+             for i in range(2000)]
+    engine = JobRecommendationEngine(os.path.join(WORKDIR, 'index'))
+    start = time.perf_counter()
+    for (text,) in texts:
+        engine.preprocess_text(text)
+    print(f"preprocess_text: {(time.perf_counter() - start) / len(texts) * 1e6:.1f} us per job text")
+
+
+if __name__ == '__main__':
+    main()
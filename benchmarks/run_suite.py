@@ -0,0 +1,202 @@
+"""Benchmark the recommendation hot paths on synthetic data at several scales.
+
+Each scale runs in its own process against a fresh SQLite database seeded with
+that many jobs and users (see synthetic.py). Measured:
+- update_job_vectors
+- get_recommendations
+- parse_resume_content on generated PDF and DOCX resumes
+- the /dashboard, /jobs and /api/recommendations routes through the Flask test client
+
+Recommendation caches are disabled so every request does the full work.
+Results include p50/p99 latency and peak traced memory per path. They are
+written as JSON; pass --compare with an earlier results file to flag regressions.
+
+Usage: python benchmarks/run_suite.py [--scales 1000,10000,100000] [--requests 200]
+                                      [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile"""
+    samples = sorted(samples)
+    return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
+
+
+def measure(calls):
+    """Time each call, then trace the peak memory of the first one again"""
+    samples = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    calls[0]()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'calls': len(samples),
+        'p50_ms': round(percentile(samples, 0.5), 3),
+        'p99_ms': round(percentile(samples, 0.99), 3),
+        'mean_ms': round(sum(samples) / len(samples), 3),
+        'peak_kib': round(peak / 1024)
+    }
+
+
+def run_scale(scale, requests, output):
+    """Child process: seed one scale and write its measurements to output"""
+    workdir = tempfile.mkdtemp(prefix=f'bench-suite-{scale}-')
+    os.chdir(workdir)  # The job index and uploads folders are relative to the working directory
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    sys.path[:0] = [REPO_DIR, BENCHMARKS_DIR]
+
+    from app import (LRUCache, app, db, ensure_job_search_index, parse_resume_content,  # noqa: E402
+                     recommendation_engine, recommendation_user)
+    from synthetic import seed_database, write_resumes  # noqa: E402
+
+    rng = random.Random(scale)
+    results = {'jobs': scale, 'users': scale, 'benchmarks': {}}
+    benchmarks = results['benchmarks']
+    with app.app_context():
+        db.create_all()
+        ensure_job_search_index()
+        start = time.perf_counter()
+        seed_database(jobs=scale, users=scale)
+        results['seed_seconds'] = round(time.perf_counter() - start, 2)
+
+        benchmarks['update_job_vectors'] = measure([recommendation_engine.update_job_vectors] * (3 if scale <= 10000 else 1))
+        recommendation_engine.profile_vector_cache = LRUCache(0)
+        recommendation_engine.recommendation_cache = LRUCache(0)
+
+        user_ids = [rng.randint(1, scale) for _ in range(requests)]
+        users = [recommendation_user(user_id) for user_id in user_ids]
+        benchmarks['get_recommendations'] = measure(
+            [lambda user=user: recommendation_engine.get_recommendations(user) for user in users])
+
+        files = write_resumes(os.path.join(workdir, 'resumes'), count=max(1, min(requests, 50) // 2))
+        for extension in ('pdf', 'docx'):
+            benchmarks[f'parse_resume_content[{extension}]'] = measure(
+                [lambda path=path, ext=ext: parse_resume_content(path, ext) for path, ext in files if ext == extension])
+        db.session.remove()
+
+    client = app.test_client()
+
+    def get(url, user_id=None):
+        def call():
+            if user_id is not None:
+                with client.session_transaction() as session:
+                    session['user_id'] = user_id
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+        return call
+
+    benchmarks['GET /dashboard'] = measure([get('/dashboard', user_id) for user_id in user_ids])
+    benchmarks['GET /jobs'] = measure([get('/jobs')] * requests)
+    benchmarks['GET /api/recommendations'] = measure([get(f'/api/recommendations/{user_id}') for user_id in user_ids])
+    results['max_rss_kib'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with open(output, 'w') as f:
+        json.dump(results, f)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_scale(scale, results):
+    print(f"\n{scale} jobs / {scale} users (seeded in {results['seed_seconds']}s, "
+          f"max RSS {results['max_rss_kib'] / 1024:.0f} MiB)")
+    print(f"  {'benchmark':<28} {'calls':>6} {'p50 ms':>10} {'p99 ms':>10} {'peak KiB':>10}")
+    for name, stats in results['benchmarks'].items():
+        print(f"  {name:<28} {stats['calls']:>6} {stats['p50_ms']:>10.2f} {stats['p99_ms']:>10.2f} "
+              f"{stats['peak_kib']:>10}")
+
+
+def compare(current, baseline, tolerance):
+    """Print p50 changes against a baseline run; returns the number of regressions"""
+    regressions = 0
+    print(f"\nCompared with {baseline['meta'].get('commit')} ({baseline['meta']['created_at']}):")
+    for scale, results in current['scales'].items():
+        previous = baseline['scales'].get(scale)
+        if previous is None:
+            continue
+        for name, stats in results['benchmarks'].items():
+            old = previous['benchmarks'].get(name)
+            if old is None or not old['p50_ms']:
+                continue
+            ratio = stats['p50_ms'] / old['p50_ms']
+            flag = ''
+            if ratio > 1 + tolerance:
+                flag = '  REGRESSION'
+                regressions += 1
+            print(f"  {scale:>7} {name:<28} {old['p50_ms']:>10.2f} -> {stats['p50_ms']:>10.2f} ms "
+                  f"({ratio:.2f}x){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', default='1000,10000,100000', help='Comma separated job/user counts.')
+    parser.add_argument('--requests', type=int, default=200, help='Calls per request-level benchmark.')
+    parser.add_argument('--output', help='Results file (default benchmark-results-<time>.json).')
+    parser.add_argument('--compare', help='Earlier results file to compare p50 latencies with.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p50 slowdown before flagging.')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--worker-output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        run_scale(args.worker, args.requests, args.worker_output)
+        return
+
+    created_at = datetime.now()
+    report = {
+        'meta': {
+            'created_at': created_at.isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'requests': args.requests
+        },
+        'scales': {}
+    }
+    for scale in [int(value) for value in args.scales.split(',')]:
+        with tempfile.NamedTemporaryFile(suffix='.json') as result_file:
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', str(scale),
+                            '--requests', str(args.requests), '--worker-output', result_file.name], check=True)
+            with open(result_file.name) as f:
+                report['scales'][str(scale)] = json.load(f)
+        print_scale(scale, report['scales'][str(scale)])
+
+    output = args.output or f"benchmark-results-{created_at:%Y%m%d-%H%M%S}.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(report, json.load(f), args.tolerance):
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Synthetic jobs, users and resume files for benchmarks.
+
+Import after pointing DATABASE_URL at a scratch database; the generators write
+through the app's models.
+"""
+import json
+import os
+import random
+
+from docx import Document
+
+from app import EDUCATION_LEVELS, EXPERIENCE_LEVELS, SKILLS_KEYWORDS, Job, User, db
+
+WORDS = ("build maintain scalable services team customers platform data pipelines product design "
+         "review mentor deliver features cloud infrastructure reliable secure").split()
+RESUME_WORDS = ("led built maintained designed delivered improved migrated mentored reviewed shipped "
+                "production systems customers team performance reliability").split()
+TITLES = ['Engineer', 'Developer', 'Architect', 'Analyst', 'Scientist']
+SENIORITY = ['Junior', '', 'Senior', 'Lead', 'Principal']
+LOCATIONS = ['New York', 'London', 'Berlin', 'Remote', 'San Francisco', 'Toronto']
+JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Remote']
+CHUNK = 5000
+
+
+class SkillMix:
+    """Draws realistic skill combinations: a few related skills from one family plus extras"""
+
+    def __init__(self, rng, families=40, family_size=12):
+        self.rng = rng
+        self.families = [rng.sample(SKILLS_KEYWORDS, family_size) for _ in range(families)]
+
+    def draw(self, count):
+        family = self.rng.choice(self.families)
+        core = self.rng.sample(family, min(count, len(family)))
+        extras = self.rng.sample(SKILLS_KEYWORDS, self.rng.randint(0, 2))
+        return list(dict.fromkeys(core + extras))
+
+
+def job_row(i, rng, mix):
+    skills = mix.draw(rng.randint(3, 6))
+    company = f"Company {i % 500}"
+    return {
+        'title': f"{rng.choice(SENIORITY)} {skills[0].title()} {rng.choice(TITLES)}".strip(),
+        'company': company,
+        'description': ' '.join(rng.choices(WORDS + skills * 3, k=rng.randint(60, 200))) + ' '
+                       + rng.choice(EDUCATION_LEVELS + [''] * 4),
+        'required_skills': ', '.join(skills),
+        'experience_required': rng.choice(list(EXPERIENCE_LEVELS)),
+        'location': rng.choice(LOCATIONS),
+        'salary': f"${rng.randint(60, 200)}k" if rng.random() < 0.6 else None,
+        'job_type': rng.choice(JOB_TYPES),
+        'posted_by': company,
+        'contact_email': 'jobs@example.com'
+    }
+
+
+def user_row(i, rng, mix):
+    skills = mix.draw(rng.randint(3, 8))
+    parsed = rng.random() < 0.7  # Most users uploaded a resume
+    return {
+        'username': f'user{i}',
+        'email': f'user{i}@example.com',
+        'password_hash': 'x',
+        'full_name': f'User {i}',
+        'skills': ', '.join(skills[:4]),
+        'experience': rng.choice(list(EXPERIENCE_LEVELS)),
+        'education': rng.choice(EDUCATION_LEVELS),
+        'location': rng.choice(LOCATIONS),
+        'phone': '555-0100',
+        'parsed_skills': json.dumps(skills if parsed else []),
+        'parsed_experience': rng.choice(list(EXPERIENCE_LEVELS)) if parsed else '',
+        'parsed_education': rng.choice(EDUCATION_LEVELS) if parsed else '',
+        'resume_text': ' '.join(rng.choices(RESUME_WORDS + skills * 2, k=rng.randint(200, 600))) if parsed else '',
+        'parse_status': 'done' if parsed else None
+    }
+
+
+def insert_rows(model, rows):
+    """Insert generated rows in bulk, CHUNK at a time"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == CHUNK:
+            db.session.execute(db.insert(model), batch)
+            batch = []
+    if batch:
+        db.session.execute(db.insert(model), batch)
+    db.session.commit()
+
+
+def seed_database(jobs, users, seed=7):
+    """Fill the current app database with generated jobs and users"""
+    rng = random.Random(seed)
+    mix = SkillMix(rng)
+    insert_rows(Job, (job_row(i, rng, mix) for i in range(jobs)))
+    insert_rows(User, (user_row(i, rng, mix) for i in range(users)))
+
+
+def resume_pages(rng, mix, pages):
+    """Lines of text per page for one resume"""
+    skills = mix.draw(6)
+    header = [f"Candidate {rng.randint(1, 10**6)}", f"{rng.randint(1, 12)} years experience",
+              f"{rng.choice(EDUCATION_LEVELS)} in Computer Science", "Skills " + ' '.join(skills)]
+    body = [[' '.join(rng.choices(RESUME_WORDS + skills, k=12)) for _ in range(40)] for _ in range(pages)]
+    body[0] = header + body[0]
+    return body
+
+
+def make_pdf(pages):
+    """Minimal uncompressed PDF with the given lines of Helvetica text on each page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        text = ' '.join(f"({line}) Tj T*" for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 40 760 Td {text} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}] /Count {len(kids)} >>"
+
+    output = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    output += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return output
+
+
+def make_docx(pages, path):
+    document = Document()
+    for lines in pages:
+        for line in lines:
+            document.add_paragraph(line)
+    document.save(path)
+
+
+def write_resumes(folder, count, seed=7, pages=2):
+    """Write count PDF and count DOCX resumes; returns [(path, extension)]"""
+    rng = random.Random(seed)
+    mix = SkillMix(rng)
+    os.makedirs(folder, exist_ok=True)
+    files = []
+    for i in range(count):
+        pdf_path = os.path.join(folder, f"resume{i}.pdf")
+        with open(pdf_path, 'wb') as f:
+            f.write(make_pdf(resume_pages(rng, mix, pages)))
+        docx_path = os.path.join(folder, f"resume{i}.docx")
+        make_docx(resume_pages(rng, mix, pages), docx_path)
+        files += [(pdf_path, 'pdf'), (docx_path, 'docx')]
+    return files